@@ -1,12 +1,13 @@
 import os
 import re
+from dataclasses import asdict
 from typing import Dict, Optional, Union
 
 import uvicorn
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel, validator
 
 from src.pdf_summarization import APIInterface
@@ -124,15 +125,40 @@ class SummarizerAPI:
         The API interface for PDF summarization.
     """
 
-    def __init__(self):
+    def __init__(self, api_interface: Optional[APIInterface] = None):
+        """
+        Initialize the SummarizerAPI and register the routes.
+
+        Parameters
+        ----------
+        api_interface : Optional[APIInterface], default=None
+            The API interface for PDF summarization. If None, a new one
+            is created. Passing a stubbed one allows load testing
+            without the OCR models, OpenAI and Slack.
+        """
         self.app = FastAPI()
-        self.api_interface = APIInterface()
+        self.api_interface = api_interface or APIInterface()
 
         self.app.add_api_route(
             "/summarize",
             self.summarize,
             methods=["POST"],
         )
+        self.app.add_api_route(
+            "/papers/{arxiv_id}",
+            self.get_paper,
+            methods=["GET"],
+        )
+        self.app.add_api_route(
+            "/search",
+            self.search,
+            methods=["GET"],
+        )
+        self.app.add_api_route(
+            "/stats",
+            self.stats,
+            methods=["GET"],
+        )
         self.app.add_event_handler("startup", self.daily_summary)
 
     def run(self):
@@ -166,6 +192,80 @@ class SummarizerAPI:
         except Exception:
             raise Exception(payload)
 
+    async def get_paper(self, arxiv_id: str) -> Dict:
+        """
+        Get a summarized paper from the archive.
+
+        Parameters
+        ----------
+        arxiv_id : str
+            The arXiv ID of the paper.
+
+        Returns
+        -------
+        Dict
+            The archived paper.
+
+        Raises
+        ------
+        HTTPException
+            If the paper has not been summarized.
+        """
+        paper = self.api_interface.archive.get(arxiv_id)
+        if paper is None:
+            raise HTTPException(status_code=404, detail="The paper is not archived.")
+
+        return asdict(paper)
+
+    async def search(
+        self,
+        q: str = Query(..., min_length=1),
+        page: int = Query(1, ge=1),
+        per_page: int = Query(20, ge=1, le=100),
+    ) -> Dict:
+        """
+        Search the summarized papers in the archive.
+
+        Parameters
+        ----------
+        q : str
+            The words to search for.
+        page : int
+            The 1-based page number of the results.
+        per_page : int
+            The number of results per page.
+
+        Returns
+        -------
+        Dict
+            The page of the results.
+        """
+        return asdict(self.api_interface.archive.search(q, page=page, per_page=per_page))
+
+    async def stats(self) -> Dict:
+        """
+        Get the latency statistics of the requests and of the slots of
+        each stage, keyed by the priority class.
+
+        Returns
+        -------
+        Dict
+            The latency statistics.
+        """
+        return {
+            "requests": {
+                priority.name.lower(): asdict(stat)
+                for priority, stat in self.api_interface.request_stats().items()
+            },
+            "stages": {
+                stage: {
+                    priority.name.lower(): asdict(stat)
+                    for priority, stat in stage_stats.items()
+                }
+                for stage, stage_stats in self.api_interface.latency_stats().items()
+            },
+        }
+
     async def daily_summary(self) -> None:
         """
         Get the daily summary of arXiv papers.
@@ -0,0 +1,132 @@
+import argparse
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.pdf_summarization._inference_backend import InferenceBackend  # noqa: E402
+from src.pdf_summarization._ocr_model import OCRModel  # noqa: E402
+
+
+def extract(ocr_model: OCRModel, pdf_paths: List[Path]) -> Dict[str, object]:
+    """
+    Extract text from every page of the PDF files and measure the time.
+
+    Parameters
+    ----------
+    ocr_model : OCRModel
+        The OCRModel instance to benchmark.
+    pdf_paths : List[Path]
+        The PDF files of the benchmark corpus.
+
+    Returns
+    -------
+    Dict[str, object]
+        The extracted texts keyed by the file name, the number of pages
+        and the elapsed time in seconds.
+    """
+    texts = {}
+    num_pages = 0
+    elapsed = 0.0
+    for pdf_path in pdf_paths:
+        page_texts = []
+        for page_number in range(1, OCRModel.count_pages(pdf_path) + 1):
+            started_at = time.perf_counter()
+            page_texts.extend(ocr_model.extract_page(pdf_path, page_number))
+            elapsed += time.perf_counter() - started_at
+            num_pages += 1
+        texts[pdf_path.name] = "\n".join(page_texts)
+
+    return {"texts": texts, "num_pages": num_pages, "elapsed": elapsed}
+
+
+def similarity(reference: str, text: str) -> float:
+    """
+    Calculate the word-level similarity of a text to the reference.
+
+    Parameters
+    ----------
+    reference : str
+        The text extracted with the reference backend.
+    text : str
+        The text extracted with the compared backend.
+
+    Returns
+    -------
+    float
+        The similarity between 0 and 1.
+    """
+    return SequenceMatcher(None, reference.split(), text.split(), autojunk=False).ratio()
+
+
+def benchmark(args: argparse.Namespace) -> None:
+    pdf_paths = sorted(Path(args.corpus_dir).glob("*.pdf"))
+    if not pdf_paths:
+        raise FileNotFoundError(f"No PDF files in {args.corpus_dir}.")
+
+    results = {}
+    for name in args.backends:
+        backend = InferenceBackend(
+            name=name,
+            model_dir=Path(args.model_dir) / name if name != "paddle" else None,
+            cpu_threads=args.cpu_threads,
+        )
+        ocr_model = OCRModel(backend=backend)
+        # warm up so that model loading is not measured
+        ocr_model.extract_page(pdf_paths[0], 1)
+        results[name] = extract(ocr_model, pdf_paths)
+
+    reference = results[args.backends[0]]
+    print(f"{'backend':<12} {'pages':>6} {'sec/page':>9} {'pages/sec':>10} {'similarity':>11}")
+    for name, result in results.items():
+        mean_similarity = sum(
+            similarity(reference["texts"][pdf_name], text)
+            for pdf_name, text in result["texts"].items()
+        ) / len(result["texts"])
+        print(
+            f"{name:<12} {result['num_pages']:>6} "
+            f"{result['elapsed'] / result['num_pages']:>9.3f} "
+            f"{result['num_pages'] / result['elapsed']:>10.2f} "
+            f"{mean_similarity:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare the throughput and the accuracy of the OCR inference "
+            "backends. The accuracy is the word-level similarity to the "
+            "text extracted with the first backend."
+        )
+    )
+    parser.add_argument(
+        "-c",
+        "--corpus_dir",
+        required=True,
+        help="The directory of the PDF files of the benchmark corpus.",
+    )
+    parser.add_argument(
+        "-b",
+        "--backends",
+        nargs="+",
+        default=["paddle", "onnx", "paddle_int8"],
+        help="The backends to compare. The first one is the reference.",
+    )
+    parser.add_argument(
+        "-m",
+        "--model_dir",
+        default="./models",
+        help="The directory which contains a model directory per backend.",
+    )
+    parser.add_argument(
+        "-t",
+        "--cpu_threads",
+        type=int,
+        default=None,
+        help="The number of intra-op threads.",
+    )
+
+    benchmark(parser.parse_args())
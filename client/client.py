@@ -1,11 +1,23 @@
 import argparse
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 import requests
 
+# Slack gives up on an event delivery which is not acked within 3 seconds
+# and retries it up to 3 times
+SLACK_ACK_TIMEOUT = 3.0
+SLACK_MAX_RETRIES = 3
+
 
 def summarize(args: argparse.Namespace) -> None:
     response = requests.post(
-        "http://0.0.0.0:8760/summarize",
+        f"{args.url}/summarize",
         json={
             "token": "Jhj5dZrVaK7ZwHHjRyZWjbDl",
             "type": "app_mention",
@@ -21,7 +33,7 @@ def summarize(args: argparse.Namespace) -> None:
 
 def challenge(args: argparse.Namespace) -> None:
     response = requests.post(
-        "http://0.0.0.0:8760/summarize",
+        f"{args.url}/summarize",
         json={
             "token": "Jhj5dZrVaK7ZwHHjRyZWjbDl",
             "challenge": "3eZbrw1aBm2rZgRNFdxV2595E9CY3gmdALWMmHkvFXO7tYXAYM8P",
@@ -31,6 +43,166 @@ def challenge(args: argparse.Namespace) -> None:
     print(response.text)
 
 
+class LoadGenerator:
+    """
+    A class to replay Slack Events API traffic against the summarize
+    endpoint: url_verification challenges, app mentions, Slack's retries
+    of unacknowledged deliveries, and the same message delivered twice
+    with the same client_msg_id.
+    """
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.session = requests.Session()
+        self.executor = ThreadPoolExecutor(max_workers=args.concurrency)
+        self.records: List[Dict] = []
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.done = threading.Condition(self.lock)
+
+    def run(self) -> None:
+        rng = random.Random(self.args.seed)
+        # fake arXiv IDs differ between runs, so that a run is not answered
+        # from the archive filled by the previous one
+        run_id = int(time.time()) % 10000
+
+        for i in range(self.args.events):
+            if rng.random() < self.args.challenge_rate:
+                self.submit("challenge", self.challenge_payload(), 0)
+            else:
+                # every message mentions its own fake arXiv ID, so that the
+                # stub server can count how many times it was processed
+                payload = self.mention_payload(f"{run_id:04d}.{i:05d}")
+                self.submit("mention", payload, 0)
+                if rng.random() < self.args.duplicate_rate:
+                    self.submit(
+                        "duplicate", {**payload, "event_id": uuid.uuid4().hex}, 0
+                    )
+
+            # Poisson arrivals
+            time.sleep(rng.expovariate(self.args.rate))
+
+        with self.done:
+            self.done.wait_for(lambda: self.pending == 0)
+        self.executor.shutdown()
+
+        self.report()
+
+    def submit(self, kind: str, payload: Dict, retry_num: int, delay: float = 0.0) -> None:
+        with self.lock:
+            self.pending += 1
+        self.executor.submit(self.send, kind, payload, retry_num, delay)
+
+    def send(self, kind: str, payload: Dict, retry_num: int, delay: float) -> None:
+        time.sleep(delay)
+
+        headers = {}
+        if retry_num > 0:
+            headers = {
+                "X-Slack-Retry-Num": str(retry_num),
+                "X-Slack-Retry-Reason": "http_timeout",
+            }
+
+        status: Optional[int] = None
+        started_at = time.perf_counter()
+        try:
+            response = self.session.post(
+                f"{self.args.url}/summarize",
+                json=payload,
+                headers=headers,
+                timeout=SLACK_ACK_TIMEOUT,
+            )
+            status = response.status_code
+        except requests.Timeout:
+            pass
+        except requests.RequestException:
+            status = -1
+        latency = time.perf_counter() - started_at
+
+        with self.lock:
+            self.records.append(
+                {
+                    "kind": kind if retry_num == 0 else "retry",
+                    "status": status,
+                    "latency": latency,
+                }
+            )
+
+        # Slack retries a delivery which timed out or failed
+        acked = status is not None and 200 <= status < 300
+        if not acked and kind != "challenge" and retry_num < SLACK_MAX_RETRIES:
+            self.submit(kind, payload, retry_num + 1, self.args.retry_delay)
+
+        with self.done:
+            self.pending -= 1
+            self.done.notify_all()
+
+    def challenge_payload(self) -> Dict:
+        return {
+            "token": "Jhj5dZrVaK7ZwHHjRyZWjbDl",
+            "challenge": uuid.uuid4().hex,
+            "type": "url_verification",
+        }
+
+    def mention_payload(self, arxiv_id: str) -> Dict:
+        return {
+            "token": "Jhj5dZrVaK7ZwHHjRyZWjbDl",
+            "type": "event_callback",
+            "event_id": uuid.uuid4().hex,
+            "event": {
+                "text": f"<@U000000> https://arxiv.org/abs/{arxiv_id}",
+                "type": "app_mention",
+                "client_msg_id": str(uuid.uuid4()),
+            },
+        }
+
+    def report(self) -> None:
+        print(
+            f"{'kind':<10} {'count':>6} {'p50':>8} {'p90':>8} {'p99':>8} "
+            f"{'max':>8} {'errors':>7} {'timeouts':>9}"
+        )
+        for kind in ["challenge", "mention", "duplicate", "retry", "all"]:
+            records = [r for r in self.records if kind in ("all", r["kind"])]
+            if not records:
+                continue
+
+            latencies = sorted(r["latency"] for r in records)
+            errors = sum(
+                r["status"] is not None and not 200 <= r["status"] < 300 for r in records
+            )
+            timeouts = sum(r["status"] is None for r in records)
+            print(
+                f"{kind:<10} {len(records):>6} "
+                + " ".join(
+                    f"{latencies[min(len(latencies) - 1, int(q * len(latencies)))]:>8.3f}"
+                    for q in (0.5, 0.9, 0.99)
+                )
+                + f" {latencies[-1]:>8.3f} {errors / len(records):>7.1%} "
+                f"{timeouts / len(records):>9.1%}"
+            )
+
+        print("status codes:", dict(Counter(r["status"] for r in self.records)))
+
+        # the server keeps processing the deliveries the client gave up on,
+        # so wait for it before counting, and the stats are only available
+        # on the stub server
+        time.sleep(self.args.drain_time)
+        try:
+            stats = self.session.get(f"{self.args.url}/stub/stats", timeout=10).json()
+        except (requests.RequestException, ValueError):
+            return
+
+        for name in ["processed", "posted"]:
+            counts = stats.get(name, {})
+            print(
+                f"{name}: {len(counts)} papers, "
+                f"{sum(max(0, count - 1) for count in counts.values())} duplicates"
+            )
+
+
+def load(args: argparse.Namespace) -> None:
+    LoadGenerator(args).run()
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -42,6 +214,64 @@ if __name__ == "__main__":
     parser.add_argument(
         "-m",
         "--mode",
+        help="summarize, challenge or load.",
+    )
+    parser.add_argument(
+        "-u",
+        "--url",
+        default="http://0.0.0.0:8760",
+        help="The base URL of the API.",
+    )
+    parser.add_argument(
+        "-n",
+        "--events",
+        type=int,
+        default=100,
+        help="[load] The number of events to send.",
+    )
+    parser.add_argument(
+        "-r",
+        "--rate",
+        type=float,
+        default=5.0,
+        help="[load] The mean number of events per second.",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=64,
+        help="[load] The maximum number of requests in flight.",
+    )
+    parser.add_argument(
+        "--challenge_rate",
+        type=float,
+        default=0.05,
+        help="[load] The ratio of url_verification challenges.",
+    )
+    parser.add_argument(
+        "--duplicate_rate",
+        type=float,
+        default=0.1,
+        help="[load] The ratio of messages delivered twice with the same client_msg_id.",
+    )
+    parser.add_argument(
+        "--retry_delay",
+        type=float,
+        default=1.0,
+        help="[load] The time in seconds before Slack retries a delivery.",
+    )
+    parser.add_argument(
+        "--drain_time",
+        type=float,
+        default=10.0,
+        help="[load] The time in seconds to wait for the server before counting duplicates.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="[load] The random seed.",
     )
 
     args = parser.parse_args()
@@ -50,3 +280,5 @@ if __name__ == "__main__":
         summarize(args)
     elif args.mode == "challenge":
         challenge(args)
+    elif args.mode == "load":
+        load(args)
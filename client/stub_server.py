@@ -0,0 +1,162 @@
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import uvicorn
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app import SummarizerAPI  # noqa: E402
+from src.pdf_summarization import api_interface  # noqa: E402
+from src.pdf_summarization._archive import SummaryArchive  # noqa: E402
+from src.pdf_summarization._id_retriever import IDRetriever  # noqa: E402
+from src.pdf_summarization._scheduler import Priority, PriorityScheduler  # noqa: E402
+from src.pdf_summarization._schema import ArxivInfo, SlackMessageData  # noqa: E402
+
+# the number of times each arXiv ID went through the pipeline and was
+# posted to Slack, which the load generator uses to count duplicates
+_lock = threading.Lock()
+_processed: Counter = Counter()
+_posted: Counter = Counter()
+
+
+class StubArxiv:
+    """
+    A stub of Arxiv which returns a fake paper without downloading it.
+    """
+
+    @staticmethod
+    def download(id_or_url: str, save_dir: Path = Path("./temp")) -> ArxivInfo:
+        arxiv_id = id_or_url.split("/")[-1]
+        with _lock:
+            _processed[arxiv_id] += 1
+        return ArxivInfo(
+            title=f"Paper {arxiv_id}",
+            abstract=f"The abstract of {arxiv_id}.",
+            path=save_dir / f"{arxiv_id}.pdf",
+        )
+
+
+class StubOCRModel:
+    """
+    A stub of OCRWorkerPool which sleeps per page instead of running OCR,
+    going through the scheduler like the real one.
+    """
+
+    def __init__(
+        self, scheduler: PriorityScheduler, num_pages: int, page_delay: float
+    ) -> None:
+        self.scheduler = scheduler
+        self.num_pages = num_pages
+        self.page_delay = page_delay
+
+    def extract_text(
+        self, pdf_file: Union[Path, bytes], priority: Priority = Priority.INTERACTIVE
+    ) -> str:
+        for _ in range(self.num_pages):
+            with self.scheduler.slot(priority):
+                time.sleep(self.page_delay)
+        return f"The text of {pdf_file}."
+
+
+class StubSummarizer:
+    """
+    A stub of Summarizer which sleeps instead of calling OpenAI's API.
+    """
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    def summarize(self, text: str, fallback: Optional[str] = None) -> str:
+        time.sleep(self.delay)
+        return f"The summary of {text}"
+
+
+def stub_post_to_slack(message_data: List[SlackMessageData]) -> None:
+    """
+    A stub of post_to_slack which only counts the posts.
+    """
+    with _lock:
+        for message_datum in message_data:
+            _posted[message_datum.url.split("/")[-1]] += 1
+
+
+def create_stub_api_interface(
+    num_pages: int, page_delay: float, summary_delay: float, archive_path: Path
+) -> api_interface.APIInterface:
+    """
+    Create an APIInterface whose OCR, OpenAI and Slack backends are
+    stubbed, while the scheduling and the archive are the real ones.
+    """
+    ocr_scheduler = PriorityScheduler(max_concurrency=1)
+    return api_interface.APIInterface(
+        ocr_scheduler=ocr_scheduler,
+        ocr_model=StubOCRModel(ocr_scheduler, num_pages, page_delay),
+        summarizer=StubSummarizer(summary_delay),
+        # no sources, so that the daily batch posts nothing
+        id_retriever=IDRetriever(sources=()),
+        archive=SummaryArchive(archive_path),
+    )
+
+
+def stats() -> Dict:
+    with _lock:
+        return {
+            "processed": dict(_processed),
+            "posted": dict(_posted),
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run the Summarizer API with stubbed OCR, OpenAI and Slack "
+            "backends for load testing."
+        )
+    )
+    parser.add_argument("-p", "--port", type=int, default=8760)
+    parser.add_argument(
+        "--num_pages",
+        type=int,
+        default=10,
+        help="The number of pages of each fake paper.",
+    )
+    parser.add_argument(
+        "--page_delay",
+        type=float,
+        default=0.05,
+        help="The time in seconds to OCR a page.",
+    )
+    parser.add_argument(
+        "--summary_delay",
+        type=float,
+        default=1.0,
+        help="The time in seconds to summarize a paper.",
+    )
+    args = parser.parse_args()
+
+    api_interface.Arxiv = StubArxiv
+    api_interface.post_to_slack = stub_post_to_slack
+
+    # SummarizerAPI writes msg_id.log to the working directory, so run in
+    # a temporary one to keep the repository and later runs clean
+    work_dir = Path(tempfile.mkdtemp())
+    os.chdir(work_dir)
+    print(f"Working directory: {work_dir}")
+
+    api = SummarizerAPI(
+        api_interface=create_stub_api_interface(
+            num_pages=args.num_pages,
+            page_delay=args.page_delay,
+            summary_delay=args.summary_delay,
+            archive_path=work_dir / "summaries.db",
+        )
+    )
+    api.app.add_api_route("/stub/stats", stats, methods=["GET"])
+    uvicorn.run(api.app, host="0.0.0.0", port=args.port)
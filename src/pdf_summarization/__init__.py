@@ -1,4 +1,5 @@
+from ._inference_backend import InferenceBackend
 from .api_interface import APIInterface
 
-__all__ = ["APIInterface"]
+__all__ = ["APIInterface", "InferenceBackend"]
 __version__ = "0.1.0"
@@ -0,0 +1,254 @@
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from ._schema import ArchivedPaper, SearchHit, SearchResult
+
+
+class SummaryArchive:
+    """
+    A class to store the summarized papers in a local SQLite database,
+    with an FTS5 full-text index over their titles, abstracts,
+    extracted texts and summaries.
+    The index uses the trigram tokenizer, because the summaries are in
+    Japanese, which has no spaces between words. With SQLite older than
+    3.34, which has no trigram tokenizer, every word is matched with
+    LIKE instead.
+
+    Attributes
+    ----------
+    path : Path
+        The path of the SQLite database.
+    """
+
+    def __init__(self, path: Path = Path("./summaries.db")) -> None:
+        """
+        Initialize the SummaryArchive and create the tables if needed.
+
+        Parameters
+        ----------
+        path : Path, default=Path("./summaries.db")
+            The path of the SQLite database.
+        """
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.__trigram = sqlite3.sqlite_version_info >= (3, 34, 0)
+        if not self.__trigram:
+            print(
+                f"SQLite {sqlite3.sqlite_version} has no trigram tokenizer, "
+                "so the archive is searched with LIKE."
+            )
+
+        # the connection is shared between the API handlers and the
+        # daily batch, so serialize the access to it
+        self.__lock = threading.Lock()
+        self.__conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.__conn.row_factory = sqlite3.Row
+        with self.__lock, self.__conn:
+            # the index of an older version, or of an older SQLite, was
+            # built with the default tokenizer, which cannot match words
+            # in Japanese text
+            row = self.__conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'papers_fts'"
+            ).fetchone()
+            rebuild = row is not None and self.__trigram and "trigram" not in row[0]
+            if rebuild:
+                self.__conn.execute("DROP TABLE papers_fts")
+
+            tokenizer = "trigram" if self.__trigram else "unicode61"
+
+            self.__conn.executescript(
+                f"""
+                PRAGMA journal_mode=WAL;
+
+                CREATE TABLE IF NOT EXISTS papers (
+                    arxiv_id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    abstract TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                );
+
+                CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+                    title, abstract, text, summary,
+                    content='papers', content_rowid='rowid',
+                    tokenize='{tokenizer}'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+                    INSERT INTO papers_fts(rowid, title, abstract, text, summary)
+                    VALUES (new.rowid, new.title, new.abstract, new.text, new.summary);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
+                    INSERT INTO papers_fts(papers_fts, rowid, title, abstract, text, summary)
+                    VALUES ('delete', old.rowid, old.title, old.abstract, old.text, old.summary);
+                END;
+                """
+            )
+            if rebuild:
+                self.__conn.execute(
+                    "INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')"
+                )
+
+    def add(
+        self, arxiv_id: str, title: str, abstract: str, text: str, summary: str
+    ) -> ArchivedPaper:
+        """
+        Store a summarized paper, replacing the previous one if exists.
+
+        Parameters
+        ----------
+        arxiv_id : str
+            The arXiv ID of the paper.
+        title : str
+            The title of the paper.
+        abstract : str
+            The abstract of the paper.
+        text : str
+            The text summarized.
+        summary : str
+            The summary of the paper.
+
+        Returns
+        -------
+        ArchivedPaper
+            The stored paper.
+        """
+        paper = ArchivedPaper(
+            arxiv_id=arxiv_id,
+            title=title,
+            abstract=abstract,
+            text=text,
+            summary=summary,
+            url=f"https://arxiv.org/abs/{arxiv_id}",
+            created_at=datetime.now(timezone.utc).isoformat(),
+        )
+        with self.__lock, self.__conn:
+            # delete first so that the trigger removes the old index entry
+            self.__conn.execute("DELETE FROM papers WHERE arxiv_id = ?", (arxiv_id,))
+            self.__conn.execute(
+                "INSERT INTO papers "
+                "(arxiv_id, title, abstract, text, summary, url, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    paper.arxiv_id,
+                    paper.title,
+                    paper.abstract,
+                    paper.text,
+                    paper.summary,
+                    paper.url,
+                    paper.created_at,
+                ),
+            )
+        return paper
+
+    def get(self, arxiv_id: str) -> Optional[ArchivedPaper]:
+        """
+        Get a stored paper.
+
+        Parameters
+        ----------
+        arxiv_id : str
+            The arXiv ID of the paper.
+
+        Returns
+        -------
+        Optional[ArchivedPaper]
+            The stored paper, or None if it has not been summarized.
+        """
+        with self.__lock:
+            row = self.__conn.execute(
+                "SELECT arxiv_id, title, abstract, text, summary, url, created_at "
+                "FROM papers WHERE arxiv_id = ?",
+                (arxiv_id,),
+            ).fetchone()
+        return ArchivedPaper(**row) if row is not None else None
+
+    def search(self, query: str, page: int = 1, per_page: int = 20) -> SearchResult:
+        """
+        Search the stored papers, ordered by relevance.
+
+        Parameters
+        ----------
+        query : str
+            The words to search for. Every word must be contained.
+        page : int, default=1
+            The 1-based page number of the results.
+        per_page : int, default=20
+            The number of results per page.
+
+        Returns
+        -------
+        SearchResult
+            The page of the results.
+        """
+        words = re.findall(r"\S+", query)
+        if not words:
+            return SearchResult(query=query, page=page, per_page=per_page, total=0, hits=[])
+
+        # the trigram index can only match words of 3 or more characters,
+        # so shorter words (e.g. 2-character Japanese words) are matched
+        # with LIKE instead
+        fts_words = [word for word in words if self.__trigram and len(word) >= 3]
+        like_words = [word for word in words if word not in fts_words]
+        like_conditions = " ".join(
+            "AND (papers.title LIKE ? ESCAPE '\\' OR papers.abstract LIKE ? ESCAPE '\\' "
+            "OR papers.text LIKE ? ESCAPE '\\' OR papers.summary LIKE ? ESCAPE '\\')"
+            for _ in like_words
+        )
+        like_params = [
+            "%" + re.sub(r"([\\%_])", r"\\\1", word) + "%"
+            for word in like_words
+            for _ in range(4)
+        ]
+
+        if fts_words:
+            # quote every word, so that user input is never parsed as the
+            # FTS5 query syntax
+            fts_query = " ".join('"' + word.replace('"', '""') + '"' for word in fts_words)
+            from_clause = (
+                "FROM papers_fts JOIN papers ON papers.rowid = papers_fts.rowid "
+                f"WHERE papers_fts MATCH ? {like_conditions}"
+            )
+            columns = (
+                "snippet(papers_fts, -1, '*', '*', '...', 16) AS snippet, "
+                "bm25(papers_fts) AS score"
+            )
+            order = "score"
+            params = [fts_query, *like_params]
+        else:
+            from_clause = f"FROM papers WHERE 1 {like_conditions}"
+            columns = "substr(papers.summary, 1, 64) AS snippet, 0.0 AS score"
+            order = "papers.created_at DESC"
+            params = like_params
+
+        with self.__lock:
+            total = self.__conn.execute(
+                f"SELECT COUNT(*) {from_clause}", params
+            ).fetchone()[0]
+            rows = self.__conn.execute(
+                f"SELECT papers.arxiv_id, papers.title, papers.url, {columns} "
+                f"{from_clause} ORDER BY {order} LIMIT ? OFFSET ?",
+                [*params, per_page, (page - 1) * per_page],
+            ).fetchall()
+
+        return SearchResult(
+            query=query,
+            page=page,
+            per_page=per_page,
+            total=total,
+            hits=[SearchHit(**row) for row in rows],
+        )
+
+    def close(self) -> None:
+        """
+        Close the connection to the database.
+        """
+        with self.__lock:
+            self.__conn.close()
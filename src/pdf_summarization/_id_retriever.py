@@ -1,16 +1,418 @@
 import re
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from typing import List
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Type
+from xml.etree.ElementTree import XMLPullParser
 
 import requests
-from bs4 import BeautifulSoup
+
+from ._schema import SourceResult
+
+ARXIV_ID_PATTERN = re.compile(r"\d{4}\.\d{5}")
+
+_SOURCES: Dict[str, Type["IDSource"]] = {}
+
+
+def register_source(name: str) -> Callable[[Type["IDSource"]], Type["IDSource"]]:
+    """
+    Register an IDSource class under the given name, so that it can be
+    selected by name in IDRetriever.
+
+    Parameters
+    ----------
+    name : str
+        The name of the source.
+
+    Returns
+    -------
+    Callable[[Type[IDSource]], Type[IDSource]]
+        The class decorator.
+    """
+
+    def decorator(source_class: Type["IDSource"]) -> Type["IDSource"]:
+        _SOURCES[name] = source_class
+        return source_class
+
+    return decorator
+
+
+class _HrefParser(HTMLParser):
+    """
+    A streaming HTML parser which collects the arXiv IDs of the hrefs
+    matching a pattern, without building a document tree.
+    """
+
+    def __init__(self, href_pattern: re.Pattern, within: Optional[str] = None) -> None:
+        super().__init__()
+        self.href_pattern = href_pattern
+        self.within = within
+        self.arxiv_ids: List[str] = []
+        self.__depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag == self.within:
+            self.__depth += 1
+        if tag != "a" or (self.within is not None and self.__depth == 0):
+            return
+
+        for key, value in attrs:
+            if key == "href" and value is not None:
+                match = self.href_pattern.match(value)
+                if match:
+                    self.arxiv_ids.append(match.group(1))
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == self.within and self.__depth > 0:
+            self.__depth -= 1
+
+
+class IDSource(ABC):
+    """
+    The base class of the sources of arXiv IDs.
+    A source fetches a document and parses it from a stream of text
+    chunks, so that parsing can be tested with saved fixtures.
+    """
+
+    @abstractmethod
+    def fetch(self, session: requests.Session) -> List[str]:
+        """
+        Fetch the arXiv IDs from the source.
+
+        Parameters
+        ----------
+        session : requests.Session
+            The session shared among the sources.
+
+        Returns
+        -------
+        List[str]
+            The list of arXiv IDs.
+        """
+
+    @staticmethod
+    def _stream(session: requests.Session, url: str) -> Iterable[str]:
+        """
+        Stream the text of a document.
+
+        Parameters
+        ----------
+        session : requests.Session
+            The session to request the document with.
+        url : str
+            The URL of the document.
+
+        Returns
+        -------
+        Iterable[str]
+            The chunks of the text of the document.
+        """
+        response = session.get(url, stream=True, timeout=30)
+        response.raise_for_status()
+        if response.encoding is None:
+            response.encoding = "utf-8"
+        return response.iter_content(chunk_size=16384, decode_unicode=True)
+
+
+@register_source("hf")
+class HFDailyPapersSource(IDSource):
+    """
+    The source of the papers curated by Hugging Face.
+
+    Attributes
+    ----------
+    day : Optional[date]
+        The day of the daily papers. If None, the day of each fetch is
+        used.
+    """
+
+    def __init__(self, day: Optional[date] = None) -> None:
+        """
+        Initialize the HFDailyPapersSource.
+
+        Parameters
+        ----------
+        day : Optional[date], default=None
+            The day of the daily papers. If None, the day of each fetch
+            is used, so that a long-running retriever follows the date.
+        """
+        self.day = day
+
+    def fetch(self, session: requests.Session) -> List[str]:
+        day = self.day or date.today()
+        return self.parse(
+            self._stream(
+                session,
+                f"https://huggingface.co/papers?date={day.strftime('%Y-%m-%d')}",
+            )
+        )
+
+    @staticmethod
+    def parse(chunks: Iterable[str]) -> List[str]:
+        """
+        Parse the arXiv IDs from the Hugging Face daily papers page.
+
+        Parameters
+        ----------
+        chunks : Iterable[str]
+            The chunks of the HTML of the page.
+
+        Returns
+        -------
+        List[str]
+            The list of arXiv IDs.
+        """
+        parser = _HrefParser(re.compile(r"^/papers/(\d{4}\.\d{5})$"), within="article")
+        for chunk in chunks:
+            parser.feed(chunk)
+        parser.close()
+        return parser.arxiv_ids
+
+
+@register_source("arxiv_listing")
+class ArxivListingSource(IDSource):
+    """
+    The source of the new submissions listed on arXiv.
+
+    Attributes
+    ----------
+    categories : Sequence[str]
+        The arXiv categories to list.
+    """
+
+    def __init__(self, categories: Sequence[str] = ("cs.CV", "cs.CL", "cs.LG")) -> None:
+        """
+        Initialize the ArxivListingSource.
+
+        Parameters
+        ----------
+        categories : Sequence[str], default=("cs.CV", "cs.CL", "cs.LG")
+            The arXiv categories to list.
+        """
+        self.categories = categories
+
+    def fetch(self, session: requests.Session) -> List[str]:
+        # fetch the categories concurrently with the shared session
+        with ThreadPoolExecutor(max_workers=len(self.categories) or 1) as executor:
+            results = executor.map(
+                lambda category: self.parse(
+                    self._stream(session, f"https://arxiv.org/list/{category}/new")
+                ),
+                self.categories,
+            )
+            return [arxiv_id for result in results for arxiv_id in result]
+
+    @staticmethod
+    def parse(chunks: Iterable[str]) -> List[str]:
+        """
+        Parse the arXiv IDs from an arXiv listing page.
+
+        Parameters
+        ----------
+        chunks : Iterable[str]
+            The chunks of the HTML of the page.
+
+        Returns
+        -------
+        List[str]
+            The list of arXiv IDs.
+        """
+        parser = _HrefParser(re.compile(r"^/abs/(\d{4}\.\d{5})$"))
+        for chunk in chunks:
+            parser.feed(chunk)
+        parser.close()
+        return parser.arxiv_ids
+
+
+@register_source("arxiv_rss")
+class ArxivRSSSource(IDSource):
+    """
+    The source of the new submissions announced in the arXiv RSS feeds.
+
+    Attributes
+    ----------
+    categories : Sequence[str]
+        The arXiv categories of the feeds.
+    """
+
+    def __init__(self, categories: Sequence[str] = ("cs.CV", "cs.CL", "cs.LG")) -> None:
+        """
+        Initialize the ArxivRSSSource.
+
+        Parameters
+        ----------
+        categories : Sequence[str], default=("cs.CV", "cs.CL", "cs.LG")
+            The arXiv categories of the feeds.
+        """
+        self.categories = categories
+
+    def fetch(self, session: requests.Session) -> List[str]:
+        return self.parse(
+            self._stream(
+                session, f"https://rss.arxiv.org/rss/{'+'.join(self.categories)}"
+            )
+        )
+
+    @staticmethod
+    def parse(chunks: Iterable[str]) -> List[str]:
+        """
+        Parse the arXiv IDs from the links of the items of an arXiv RSS
+        feed.
+
+        Parameters
+        ----------
+        chunks : Iterable[str]
+            The chunks of the XML of the feed.
+
+        Returns
+        -------
+        List[str]
+            The list of arXiv IDs.
+        """
+        arxiv_ids = []
+        parser = XMLPullParser(events=("end",))
+        for chunk in chunks:
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                # ignore the namespace of the tag
+                if element.tag.rsplit("}", 1)[-1] == "link" and element.text:
+                    match = re.search(r"/abs/(\d{4}\.\d{5})", element.text)
+                    if match:
+                        arxiv_ids.append(match.group(1))
+                element.clear()
+        parser.close()
+        return arxiv_ids
+
+
+@register_source("file")
+class LocalFileSource(IDSource):
+    """
+    The source of the arXiv IDs listed in local files.
+
+    Attributes
+    ----------
+    paths : Sequence[Path]
+        The paths of the files.
+    """
+
+    def __init__(self, paths: Sequence[Path] = (Path("./arxiv_ids.txt"),)) -> None:
+        """
+        Initialize the LocalFileSource.
+
+        Parameters
+        ----------
+        paths : Sequence[Path], default=(Path("./arxiv_ids.txt"),)
+            The paths of the files. Missing files are skipped.
+        """
+        self.paths = paths
+
+    def fetch(self, session: requests.Session) -> List[str]:
+        arxiv_ids = []
+        for path in self.paths:
+            if not Path(path).exists():
+                continue
+            with open(path, "r") as f:
+                arxiv_ids.extend(self.parse(f))
+        return arxiv_ids
+
+    @staticmethod
+    def parse(chunks: Iterable[str]) -> List[str]:
+        """
+        Parse the arXiv IDs from a text which contains them.
+
+        Parameters
+        ----------
+        chunks : Iterable[str]
+            The chunks (e.g. lines) of the text.
+
+        Returns
+        -------
+        List[str]
+            The list of arXiv IDs.
+        """
+        return [
+            arxiv_id for chunk in chunks for arxiv_id in ARXIV_ID_PATTERN.findall(chunk)
+        ]
 
 
 class IDRetriever:
     """
     The IDRetriever class that retrieves arXiv IDs from various sources.
-    Currently, it only supports Hugging Face.
+    The sources are fetched concurrently with a shared session, and
+    their results are merged and deduplicated.
+
+    Attributes
+    ----------
+    sources : Dict[str, IDSource]
+        The sources keyed by their names.
+    results : List[SourceResult]
+        The results of each source of the last retrieval.
     """
+
+    def __init__(self, sources: Sequence[str] = ("hf",), **source_kwargs: Dict) -> None:
+        """
+        Initialize the IDRetriever with the registered sources.
+
+        Parameters
+        ----------
+        sources : Sequence[str], default=("hf",)
+            The names of the sources to retrieve from.
+        **source_kwargs : Dict
+            The keyword arguments of each source, keyed by its name.
+
+        Raises
+        ------
+        ValueError
+            If a source is not registered.
+        """
+        unknown_sources = [name for name in sources if name not in _SOURCES]
+        if unknown_sources:
+            raise ValueError(
+                f"Unknown sources: {unknown_sources}. "
+                f"Available sources are {sorted(_SOURCES)}."
+            )
+
+        self.sources = {
+            name: _SOURCES[name](**source_kwargs.get(name, {})) for name in sources
+        }
+        self.results: List[SourceResult] = []
+
+    def retrieve(self) -> List[str]:
+        """
+        Retrieve the arXiv IDs from all of the sources.
+        A source which fails is reported and skipped.
+
+        Returns
+        -------
+        List[str]
+            The list of arXiv IDs, deduplicated in the order of the
+            sources.
+        """
+        with requests.Session() as session:
+            with ThreadPoolExecutor(max_workers=len(self.sources) or 1) as executor:
+                self.results = list(
+                    executor.map(
+                        lambda item: self.__fetch(item[0], item[1], session),
+                        self.sources.items(),
+                    )
+                )
+
+        for result in self.results:
+            print(
+                f"[{result.source}] {len(result.arxiv_ids)} IDs "
+                f"in {result.elapsed:.2f}s"
+                + (f" (failed: {result.error})" if result.error else "")
+            )
+
+        return list(
+            dict.fromkeys(
+                arxiv_id for result in self.results for arxiv_id in result.arxiv_ids
+            )
+        )
+
     @staticmethod
     def retrieve_from_hf() -> List[str]:
         """
@@ -21,18 +423,38 @@ class IDRetriever:
         List[str]
             The list of arXiv IDs.
         """
-        soup = BeautifulSoup(
-            requests.get(
-                f"https://huggingface.co/papers?date={date.today().strftime('%Y-%m-%d')}"
-            ).text,
-            "html.parser",
-        )
+        return IDRetriever(sources=("hf",)).retrieve()
 
-        arxiv_ids = []
-        for article in soup.find_all("article"):
-            for a in article.find_all("a"):
-                href = a.get("href")
-                if re.match(r"^/papers/\d{4}\.\d{5}$", href):
-                    arxiv_ids.append(href.split("/")[-1])
+    @staticmethod
+    def __fetch(name: str, source: IDSource, session: requests.Session) -> SourceResult:
+        """
+        Fetch the arXiv IDs from a source and measure the time.
 
-        return list(set(arxiv_ids))
+        Parameters
+        ----------
+        name : str
+            The name of the source.
+        source : IDSource
+            The source.
+        session : requests.Session
+            The session shared among the sources.
+
+        Returns
+        -------
+        SourceResult
+            The result of the source.
+        """
+        started_at = time.perf_counter()
+        try:
+            arxiv_ids = source.fetch(session)
+            error = None
+        except Exception as e:
+            arxiv_ids = []
+            error = repr(e)
+
+        return SourceResult(
+            source=name,
+            arxiv_ids=arxiv_ids,
+            elapsed=time.perf_counter() - started_at,
+            error=error,
+        )
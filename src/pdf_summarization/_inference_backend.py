@@ -0,0 +1,124 @@
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+BACKENDS = ("paddle", "onnx", "paddle_int8")
+
+
+@dataclass(frozen=True)
+class InferenceBackend:
+    """
+    A class to select the inference backend of the layout and
+    recognition models.
+
+    - ``paddle``: the full-precision Paddle inference models downloaded
+      by PaddleOCR, which is the default.
+    - ``onnx``: the models exported with paddle2onnx, run by ONNX
+      Runtime on CPU. ``model_dir`` must contain ``layout.onnx``,
+      ``det.onnx`` and ``rec.onnx``.
+    - ``paddle_int8``: the int8-quantized (PaddleSlim) Paddle inference
+      models, run with MKL-DNN on CPU. ``model_dir`` must contain the
+      ``layout``, ``det`` and ``rec`` model directories.
+
+    Attributes
+    ----------
+    name : str
+        The name of the backend.
+    model_dir : Optional[Path]
+        The directory of the local model files. Required unless the
+        backend is ``paddle``.
+    cpu_threads : Optional[int]
+        The number of intra-op threads. If None, the default of the
+        runtime is used.
+    """
+
+    name: str = "paddle"
+    model_dir: Optional[Path] = None
+    cpu_threads: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.name not in BACKENDS:
+            raise ValueError(
+                f"Unknown inference backend: {self.name}. "
+                f"Available backends are {BACKENDS}."
+            )
+        if self.name != "paddle" and self.model_dir is None:
+            raise ValueError(f"The {self.name} backend requires model_dir.")
+
+    @classmethod
+    def from_env(cls) -> "InferenceBackend":
+        """
+        Create the backend from the environment variables
+        ``OCR_BACKEND``, ``OCR_MODEL_DIR`` and ``OCR_CPU_THREADS``.
+
+        Returns
+        -------
+        InferenceBackend
+            The backend.
+        """
+        model_dir = os.getenv("OCR_MODEL_DIR")
+        cpu_threads = os.getenv("OCR_CPU_THREADS")
+        return cls(
+            name=os.getenv("OCR_BACKEND", "paddle"),
+            model_dir=Path(model_dir) if model_dir else None,
+            cpu_threads=int(cpu_threads) if cpu_threads else None,
+        )
+
+    def layout_kwargs(self) -> Dict[str, Any]:
+        """
+        Get the keyword arguments of PPStructure for the backend.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The keyword arguments.
+        """
+        return self.__kwargs("layout")
+
+    def ocr_kwargs(self) -> Dict[str, Any]:
+        """
+        Get the keyword arguments of PaddleOCR for the backend.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The keyword arguments.
+        """
+        return {**self.__kwargs("det"), **self.__kwargs("rec")}
+
+    def __kwargs(self, model: str) -> Dict[str, Any]:
+        """
+        Get the keyword arguments to load a model with the backend.
+
+        Parameters
+        ----------
+        model : str
+            The kind of the model, one of ``layout``, ``det`` or ``rec``.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The keyword arguments.
+        """
+        kwargs: Dict[str, Any] = {}
+        if self.cpu_threads is not None:
+            kwargs["cpu_threads"] = self.cpu_threads
+
+        if self.name == "onnx":
+            kwargs["use_gpu"] = False
+            kwargs["use_onnx"] = True
+            kwargs[f"{model}_model_dir"] = str(self.model_dir / f"{model}.onnx")
+            if self.cpu_threads is not None:
+                # PaddleOCR passes the session options to ONNX Runtime
+                import onnxruntime as ort
+
+                sess_options = ort.SessionOptions()
+                sess_options.intra_op_num_threads = self.cpu_threads
+                kwargs["onnx_sess_options"] = sess_options
+        elif self.name == "paddle_int8":
+            kwargs["use_gpu"] = False
+            kwargs["enable_mkldnn"] = True
+            kwargs[f"{model}_model_dir"] = str(self.model_dir / model)
+
+        return kwargs
@@ -1,138 +1,194 @@
 import re
 from pathlib import Path
-from typing import List, Union
+from typing import Collection, List, Set, Union
 
 import nltk
 import numpy as np
 from nltk.corpus import words
 from paddleocr import PaddleOCR, PPStructure
-from pdf2image import convert_from_bytes, convert_from_path
+from pdf2image import (
+    convert_from_bytes,
+    convert_from_path,
+    pdfinfo_from_bytes,
+    pdfinfo_from_path,
+)
 from PIL import Image
-from tqdm import tqdm
-from transformers import GPT2Tokenizer
+
+from ._inference_backend import InferenceBackend
 
 
 class OCRModel:
     """
-    The OCRModel class that extracts text from a PDF file.
+    The OCRModel class that extracts text from a page of a PDF file.
     PPStructure is used to extract the layout of the PDF file,
     and PaddleOCR is used to extract the text from the PDF file.
+    The pages are scheduled and joined by OCRWorkerPool.
 
     Attributes
     ----------
-    max_length : int
-        The maximum token length of the text to handle with OpenAI API.
     layout_model : PPStructure
         The layout model.
     ocr_model : PaddleOCR
         The OCR model.
-    tokenizer : GPT2Tokenizer
-        The GPT2Tokenizer instance to calculate the token length.
+    vocabulary : Set[str]
+        The set of English words in lowercase.
     """
 
-    def __init__(self, max_length: int = 16000):
+    def __init__(self, backend: InferenceBackend = InferenceBackend()):
         """
         Initialize the OCRModel with layout and OCR models, and download
         the set of English words.
 
         Parameters
         ----------
-        max_length : int
-            The maximum length of the text to be extracted.
+        backend : InferenceBackend, default=InferenceBackend()
+            The inference backend of the layout and OCR models.
         """
-        self.max_length = max_length
-        self.layout_model = PPStructure(table=False, ocr=False, lang="en")
-        self.ocr_model = PaddleOCR(ocr=True, lang="en", ocr_version="PP-OCRv3")
-        self.tokenizer = GPT2Tokenizer.from_pretrained("gpt2")
+        self.layout_model = PPStructure(
+            table=False, ocr=False, lang="en", **backend.layout_kwargs()
+        )
+        self.ocr_model = PaddleOCR(
+            ocr=True, lang="en", ocr_version="PP-OCRv3", **backend.ocr_kwargs()
+        )
 
         # Download the set of English words
         nltk.download("words")
+        self.vocabulary = {word.lower() for word in words.words()}
 
-    def extract_text(self, pdf_file: Union[Path, bytes]) -> Union[str, None]:
+    def extract_page(self, pdf_file: Union[Path, bytes], page_number: int) -> List[str]:
         """
-        Extract text from a PDF file.
-        If the extracted text is too long, return None instead.
+        Extract text from a page of a PDF file.
+        Only the page is rasterized, so the memory used does not grow
+        with the number of pages.
 
         Parameters
         ----------
         pdf_file : Union[Path, bytes]
             The PDF file to extract text from, either as a Path or bytes.
+        page_number : int
+            The 1-based number of the page.
 
         Returns
         -------
-        str
-            The extracted text.
+        List[str]
+            The texts of the blocks in the page.
         """
         texts = []
-        pil_images = self.__convert_pdf_to_pil(pdf_file)
-        for pil_image in tqdm(pil_images):
-            result = self.layout_model(np.array(pil_image, dtype=np.uint8))
-            for line in result:
-                if not line["type"] == "title":
-                    ocr_results = list(
-                        map(lambda x: x[0], self.ocr_model(line["img"])[1])
-                    )
-
-                    if len(ocr_results) > 1:
-                        text = " ".join(ocr_results)
-                        text = re.sub(r"\n|\t|\/|\|", " ", text)
-
-                        if self.__is_unnecessary(text):
-                            continue
-
-                        texts.append(text)
-                else:
-                    try:
-                        title = self.ocr_model(line["img"])[1][0][0]
-                    except IndexError:
+        pil_image = self.__convert_page_to_pil(pdf_file, page_number)
+        result = self.layout_model(np.array(pil_image, dtype=np.uint8))
+        for line in result:
+            if not line["type"] == "title":
+                ocr_results = list(
+                    map(lambda x: x[0], self.ocr_model(line["img"])[1])
+                )
+
+                if len(ocr_results) > 1:
+                    text = self.join_lines(ocr_results, self.vocabulary)
+                    text = re.sub(r"\n|\t|\/|\|", " ", text)
+
+                    if self.__is_unnecessary(text):
                         continue
 
-                    # if title is "References" or "Reference", stop extracting
-                    # because the following text is references and appendices
-                    # which are might be unnecessary for our purpose
-                    if title.lower() == "references" or title.lower() == "reference":
-                        break
-                    texts.append(title)
+                    texts.append(text)
+            else:
+                try:
+                    title = self.ocr_model(line["img"])[1][0][0]
+                except IndexError:
+                    continue
+
+                # if title is "References" or "Reference", stop extracting
+                # because the following text is references and appendices
+                # which are might be unnecessary for our purpose
+                if title.lower() == "references" or title.lower() == "reference":
+                    break
+                texts.append(title)
+
+        return texts
+
+    @staticmethod
+    def count_pages(pdf_file: Union[Path, bytes]) -> int:
+        """
+        Count the number of pages of a PDF file.
+
+        Parameters
+        ----------
+        pdf_file : Union[Path, bytes]
+            The PDF file, either as a Path or bytes.
 
-        if not self.__is_too_long("\n".join(texts)):
-            return "\n".join(texts)
+        Returns
+        -------
+        int
+            The number of pages.
+        """
+        if isinstance(pdf_file, Path):
+            return pdfinfo_from_path(pdf_file)["Pages"]
         else:
-            return None
+            return pdfinfo_from_bytes(pdf_file)["Pages"]
 
-    def __convert_pdf_to_pil(self, pdf_file: Union[Path, bytes]) -> List[Image.Image]:
+    def __convert_page_to_pil(
+        self, pdf_file: Union[Path, bytes], page_number: int
+    ) -> Image.Image:
         """
-        Convert a PDF file to a list of PIL images.
+        Convert a page of a PDF file to a PIL image.
 
         Parameters
         ----------
         pdf_file : Union[Path, bytes]
             The PDF file to convert, either as a Path or bytes.
+        page_number : int
+            The 1-based number of the page.
 
         Returns
         -------
-        List[Image.Image]
-            The list of PIL images.
+        Image.Image
+            The PIL image of the page.
         """
         if isinstance(pdf_file, Path):
-            return convert_from_path(pdf_file, dpi=200)
+            return convert_from_path(
+                pdf_file, dpi=200, first_page=page_number, last_page=page_number
+            )[0]
         else:
-            return convert_from_bytes(pdf_file, dpi=200)
+            return convert_from_bytes(
+                pdf_file, dpi=200, first_page=page_number, last_page=page_number
+            )[0]
 
-    def __is_too_long(self, text: str) -> bool:
+    @staticmethod
+    def join_lines(lines: List[str], vocabulary: Collection[str]) -> str:
         """
-        Check if a text is too long based on the number of tokens.
+        Join the OCR lines of a block, joining the words split by
+        hyphenation at the end of a line.
+        The hyphen is removed only if the joined word is in the
+        vocabulary or the part before it is not a word on its own, so
+        that compound words (e.g. "self-supervised") keep it.
+        A hyphen followed by a conjunction (e.g. "first- and
+        second-order") is kept with the space.
 
         Parameters
         ----------
-        text : str
-            The text to check.
+        lines : List[str]
+            The OCR lines of a block.
+        vocabulary : Collection[str]
+            The English words in lowercase.
 
         Returns
         -------
-        bool
-            True if the text is too long, False otherwise.
+        str
+            The text of the block.
         """
-        return len(self.tokenizer(text)["input_ids"]) > self.max_length - 2000
+        text = lines[0]
+        for line in lines[1:]:
+            head = re.search(r"([a-z]+)-$", text)
+            tail = re.match(r"[a-z]+", line)
+            if head is None or tail is None or line.split()[0] in ("and", "or", "to"):
+                text = text + " " + line
+            elif (
+                head.group(1) + tail.group(0) in vocabulary
+                or head.group(1) not in vocabulary
+            ):
+                text = text[:-1] + line
+            else:
+                text = text + line
+        return text
 
     def __is_unnecessary(self, text: str) -> bool:
         """
@@ -178,12 +234,10 @@ class OCRModel:
         bool
             True if the text is meaningless, False otherwise.
         """
-        # Create a set of English words
-        word_list = set(words.words())
         # Break the text into words
         words_in_text = text.split()
         # Check if each word is in the English dictionary
         num_valid_words = len(
-            [word for word in words_in_text if word.lower() not in word_list]
+            [word for word in words_in_text if word.lower() not in self.vocabulary]
         )
         return num_valid_words / len(words_in_text) > 0.5
@@ -0,0 +1,537 @@
+import multiprocessing
+import queue
+import tempfile
+import time
+from contextlib import contextmanager, nullcontext
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import ContextManager, Iterator, List, Optional, Union
+
+from tqdm import tqdm
+
+from ._inference_backend import InferenceBackend
+from ._ocr_model import OCRModel
+from ._scheduler import Priority, PriorityScheduler
+from ._schema import WorkerStats
+
+
+class OCRWorkerError(RuntimeError):
+    """
+    An error raised when an OCR worker dies, exceeds its memory ceiling
+    or times out while loading the models or extracting a page.
+    """
+
+
+class OCRPageError(RuntimeError):
+    """
+    An error raised when an OCR worker fails to extract a page but is
+    still alive, e.g. the page cannot be rendered.
+    """
+
+
+def get_rss_mb(pid: int) -> float:
+    """
+    Get the resident set size of a process.
+
+    Parameters
+    ----------
+    pid : int
+        The process ID.
+
+    Returns
+    -------
+    float
+        The resident set size in MB, or 0.0 if it cannot be read.
+    """
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+@contextmanager
+def _as_path(pdf_file: Union[Path, bytes]) -> Iterator[Path]:
+    """
+    Provide a PDF file as a path which the workers can read.
+    If the PDF file is given as bytes, it is written to a temporary file
+    which is removed on exit.
+
+    Parameters
+    ----------
+    pdf_file : Union[Path, bytes]
+        The PDF file, either as a Path or bytes.
+    """
+    if isinstance(pdf_file, Path):
+        yield pdf_file
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as f:
+        f.write(pdf_file)
+        f.flush()
+        yield Path(f.name)
+
+
+def _serve(conn: Connection, backend: InferenceBackend) -> None:
+    """
+    The main loop of an OCR worker process.
+    Receive a pair of a PDF path and a page number, and send back the
+    texts of the page.
+
+    Parameters
+    ----------
+    conn : Connection
+        The connection to the supervisor.
+    backend : InferenceBackend
+        The inference backend of the layout and OCR models.
+    """
+    ocr_model = OCRModel(backend=backend)
+    conn.send(("ready", None))
+
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+
+        pdf_path, page_number = request
+        try:
+            conn.send(("ok", ocr_model.extract_page(Path(pdf_path), page_number)))
+        except Exception as e:
+            conn.send(("error", repr(e)))
+
+
+class OCRWorker:
+    """
+    A class to supervise an OCR worker process.
+
+    Attributes
+    ----------
+    worker_id : int
+        The ID of the worker.
+    max_rss_mb : float
+        The hard memory ceiling in MB. The process is killed as soon as
+        its RSS exceeds it.
+    backend : InferenceBackend
+        The inference backend of the layout and OCR models.
+    start_timeout : Optional[float]
+        The maximum time in seconds to load the models.
+    pages_processed : int
+        The number of pages processed by the current process.
+    restarts : int
+        The number of times the process has been replaced.
+    """
+
+    def __init__(
+        self,
+        worker_id: int,
+        max_rss_mb: float,
+        backend: InferenceBackend = InferenceBackend(),
+        start_timeout: Optional[float] = 600,
+    ) -> None:
+        """
+        Initialize the OCRWorker and start its process.
+
+        Parameters
+        ----------
+        worker_id : int
+            The ID of the worker.
+        max_rss_mb : float
+            The hard memory ceiling in MB.
+        backend : InferenceBackend, default=InferenceBackend()
+            The inference backend of the layout and OCR models.
+        start_timeout : Optional[float], default=600
+            The maximum time in seconds to load the models.
+        """
+        self.worker_id = worker_id
+        self.max_rss_mb = max_rss_mb
+        self.backend = backend
+        self.start_timeout = start_timeout
+        self.pages_processed = 0
+        self.restarts = 0
+
+        self.__process: Optional[multiprocessing.Process] = None
+        self.__conn: Optional[Connection] = None
+        self.start()
+
+    def start(self) -> None:
+        """
+        Start a fresh process, and wait until its models are loaded.
+
+        Raises
+        ------
+        OCRWorkerError
+            If the process dies, exceeds its memory ceiling or times out
+            while loading the models.
+        """
+        # PaddlePaddle is not fork-safe, so always spawn a new interpreter
+        context = multiprocessing.get_context("spawn")
+        self.__conn, child_conn = context.Pipe()
+        self.__process = context.Process(
+            target=_serve,
+            args=(child_conn, self.backend),
+            daemon=True,
+        )
+        self.__process.start()
+        child_conn.close()
+        self.pages_processed = 0
+
+        # a hung model load would hold the slot of the scheduler forever
+        self.__receive(timeout=self.start_timeout)
+
+    def stop(self) -> None:
+        """
+        Stop the process, killing it if it does not exit in time.
+        """
+        if self.__process is None:
+            return
+
+        if self.__process.is_alive():
+            try:
+                self.__conn.send(None)
+            except OSError:
+                pass
+            self.__process.join(timeout=10)
+            if self.__process.is_alive():
+                self.__process.kill()
+                self.__process.join()
+
+        self.__conn.close()
+        self.__process = None
+
+    def restart(self) -> None:
+        """
+        Replace the process with a fresh one.
+        """
+        self.stop()
+        self.restarts += 1
+        self.start()
+
+    @property
+    def is_alive(self) -> bool:
+        """
+        Whether the process is running.
+        """
+        return self.__process is not None and self.__process.is_alive()
+
+    @property
+    def rss_mb(self) -> float:
+        """
+        The resident set size of the process in MB.
+        """
+        if not self.is_alive:
+            return 0.0
+        return get_rss_mb(self.__process.pid)
+
+    def extract_page(
+        self, pdf_path: Path, page_number: int, timeout: Optional[float] = None
+    ) -> List[str]:
+        """
+        Extract text from a page of a PDF file in the process.
+
+        Parameters
+        ----------
+        pdf_path : Path
+            The path of the PDF file.
+        page_number : int
+            The 1-based number of the page.
+        timeout : Optional[float], default=None
+            The maximum time in seconds to wait for the page.
+
+        Returns
+        -------
+        List[str]
+            The texts of the blocks in the page.
+
+        Raises
+        ------
+        OCRWorkerError
+            If the process dies, exceeds its memory ceiling or times out.
+        OCRPageError
+            If the process fails to extract the page.
+        """
+        try:
+            self.__conn.send((str(pdf_path), page_number))
+        except OSError as e:
+            raise OCRWorkerError(f"Worker {self.worker_id} is not reachable.") from e
+
+        texts = self.__receive(timeout=timeout)
+        self.pages_processed += 1
+        return texts
+
+    def stats(self) -> WorkerStats:
+        """
+        Get the statistics of the worker.
+
+        Returns
+        -------
+        WorkerStats
+            The statistics of the worker.
+        """
+        return WorkerStats(
+            worker_id=self.worker_id,
+            pid=self.__process.pid if self.__process is not None else None,
+            rss_mb=self.rss_mb,
+            pages_processed=self.pages_processed,
+            restarts=self.restarts,
+        )
+
+    def __receive(self, timeout: Optional[float]):
+        """
+        Wait for a message from the process while watching its memory.
+
+        Parameters
+        ----------
+        timeout : Optional[float]
+            The maximum time in seconds to wait.
+
+        Returns
+        -------
+        Any
+            The payload of the message.
+
+        Raises
+        ------
+        OCRWorkerError
+            If the process dies, exceeds its memory ceiling or times out.
+        OCRPageError
+            If the process fails to extract the page.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.__conn.poll(1.0):
+            if not self.__process.is_alive():
+                raise OCRWorkerError(
+                    f"Worker {self.worker_id} died "
+                    f"with exit code {self.__process.exitcode}."
+                )
+            rss_mb = self.rss_mb
+            if rss_mb > self.max_rss_mb:
+                self.__process.kill()
+                raise OCRWorkerError(
+                    f"Worker {self.worker_id} exceeded the memory ceiling "
+                    f"({rss_mb:.0f}MB > {self.max_rss_mb:.0f}MB)."
+                )
+            if deadline is not None and time.monotonic() > deadline:
+                self.__process.kill()
+                raise OCRWorkerError(f"Worker {self.worker_id} timed out.")
+
+        try:
+            status, payload = self.__conn.recv()
+        except EOFError as e:
+            raise OCRWorkerError(f"Worker {self.worker_id} died.") from e
+
+        if status == "error":
+            raise OCRPageError(f"Worker {self.worker_id} failed: {payload}")
+        return payload
+
+
+class OCRWorkerPool:
+    """
+    A class to extract text from PDF files in supervised worker
+    processes, so that the memory grown by PaddleOCR and PPStructure is
+    given back to the OS periodically.
+    A worker is recycled after a number of pages or when its RSS exceeds
+    a threshold, and a page whose worker dies is retried on a fresh one,
+    so that the paper in progress is completed transparently. A page
+    which the worker fails to extract, or which fails on every retry
+    (e.g. it always exceeds the memory ceiling), is skipped.
+
+    Attributes
+    ----------
+    scheduler : Optional[PriorityScheduler]
+        The scheduler which each page is processed through.
+    workers : List[OCRWorker]
+        The supervised workers.
+    recycle_pages : int
+        The number of pages after which a worker is recycled.
+    recycle_rss_mb : float
+        The RSS in MB above which a worker is recycled after its page.
+    max_retries : int
+        The maximum number of times a page is retried on a fresh worker.
+    page_timeout : Optional[float]
+        The maximum time in seconds to extract a page.
+    """
+
+    def __init__(
+        self,
+        scheduler: Optional[PriorityScheduler] = None,
+        num_workers: int = 1,
+        recycle_pages: int = 200,
+        recycle_rss_mb: float = 4096,
+        max_rss_mb: float = 6144,
+        max_retries: int = 2,
+        page_timeout: Optional[float] = 600,
+        start_timeout: Optional[float] = 600,
+        backend: InferenceBackend = InferenceBackend(),
+    ) -> None:
+        """
+        Initialize the OCRWorkerPool and start the workers.
+
+        Parameters
+        ----------
+        scheduler : Optional[PriorityScheduler], default=None
+            The scheduler which each page is processed through.
+            If None, pages are processed without scheduling.
+        num_workers : int, default=1
+            The number of worker processes.
+        recycle_pages : int, default=200
+            The number of pages after which a worker is recycled.
+        recycle_rss_mb : float, default=4096
+            The RSS in MB above which a worker is recycled after its page.
+        max_rss_mb : float, default=6144
+            The hard memory ceiling in MB of a worker.
+        max_retries : int, default=2
+            The maximum number of times a page is retried on a fresh
+            worker.
+        page_timeout : Optional[float], default=600
+            The maximum time in seconds to extract a page.
+        start_timeout : Optional[float], default=600
+            The maximum time in seconds for a worker to load the models.
+        backend : InferenceBackend, default=InferenceBackend()
+            The inference backend of the layout and OCR models.
+        """
+        self.scheduler = scheduler
+        self.recycle_pages = recycle_pages
+        self.recycle_rss_mb = recycle_rss_mb
+        self.max_retries = max_retries
+        self.page_timeout = page_timeout
+
+        self.workers = [
+            OCRWorker(
+                worker_id=i,
+                max_rss_mb=max_rss_mb,
+                backend=backend,
+                start_timeout=start_timeout,
+            )
+            for i in range(num_workers)
+        ]
+        self.__idle_workers: "queue.Queue[OCRWorker]" = queue.Queue()
+        for worker in self.workers:
+            self.__idle_workers.put(worker)
+
+    def extract_text(
+        self,
+        pdf_file: Union[Path, bytes],
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> str:
+        """
+        Extract text from a PDF file.
+
+        Parameters
+        ----------
+        pdf_file : Union[Path, bytes]
+            The PDF file to extract text from, either as a Path or bytes.
+        priority : Priority, default=Priority.INTERACTIVE
+            The priority class to schedule each page with.
+
+        Returns
+        -------
+        str
+            The extracted text.
+        """
+        with _as_path(pdf_file) as pdf_path:
+            texts = []
+            for page_number in tqdm(range(1, OCRModel.count_pages(pdf_path) + 1)):
+                with self.__page_slot(priority):
+                    texts.extend(self.__extract_page(pdf_path, page_number))
+
+        for stat in self.stats():
+            print(
+                f"[ocr worker {stat.worker_id}] pid={stat.pid} "
+                f"rss={stat.rss_mb:.0f}MB pages={stat.pages_processed} "
+                f"restarts={stat.restarts}"
+            )
+
+        return "\n".join(texts)
+
+    def stats(self) -> List[WorkerStats]:
+        """
+        Get the statistics of each worker.
+
+        Returns
+        -------
+        List[WorkerStats]
+            The statistics of each worker.
+        """
+        return [worker.stats() for worker in self.workers]
+
+    def close(self) -> None:
+        """
+        Stop all of the workers.
+        """
+        for worker in self.workers:
+            worker.stop()
+
+    def __extract_page(self, pdf_path: Path, page_number: int) -> List[str]:
+        """
+        Extract text from a page on an idle worker, retrying on a fresh
+        worker if it dies, exceeds its memory ceiling or times out.
+        The page is skipped if the worker fails to extract it or it
+        fails on every retry, so that one page does not fail the paper
+        nor the daily batch.
+
+        Parameters
+        ----------
+        pdf_path : Path
+            The path of the PDF file.
+        page_number : int
+            The 1-based number of the page.
+
+        Returns
+        -------
+        List[str]
+            The texts of the blocks in the page, or an empty list if the
+            page is skipped.
+        """
+        worker = self.__idle_workers.get()
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    # a stopped or dead worker is replaced lazily, so that
+                    # a failure to start it also counts as an attempt
+                    if not worker.is_alive:
+                        worker.restart()
+                    texts = worker.extract_page(
+                        pdf_path, page_number, timeout=self.page_timeout
+                    )
+                except OCRPageError as e:
+                    print(f"{e} Skipping page {page_number}...")
+                    return []
+                except OCRWorkerError as e:
+                    worker.stop()
+                    if attempt == self.max_retries:
+                        print(f"{e} Skipping page {page_number} after {attempt} retries...")
+                        return []
+                    print(f"{e} Retrying page {page_number} on a fresh worker...")
+                    continue
+
+                if (
+                    worker.pages_processed >= self.recycle_pages
+                    or worker.rss_mb > self.recycle_rss_mb
+                ):
+                    print(f"Recycling worker {worker.worker_id}...")
+                    worker.stop()
+                return texts
+        finally:
+            self.__idle_workers.put(worker)
+
+    def __page_slot(self, priority: Priority) -> ContextManager[None]:
+        """
+        Get the context to process a page in.
+
+        Parameters
+        ----------
+        priority : Priority
+            The priority class of the page.
+
+        Returns
+        -------
+        ContextManager[None]
+            The slot of the scheduler, or an empty context if there is
+            no scheduler.
+        """
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot(priority)
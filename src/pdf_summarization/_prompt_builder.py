@@ -0,0 +1,139 @@
+import inspect
+import re
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from ._schema import CompactedText
+
+
+class PromptBuilder:
+    """
+    A class to build the chat messages sent to OpenAI's API.
+    The fixed part of the prompt is rendered once at class definition,
+    and the OCR text is compacted before being embedded into it.
+
+    Attributes
+    ----------
+    count_tokens : Callable[[str], int]
+        The function to count the tokens of a text.
+    min_header_repeats : int
+        The minimum number of occurrences for a short line to be
+        regarded as a running header or footer.
+    max_header_length : int
+        The maximum number of characters of a running header or footer.
+    """
+
+    USER_PROMPT = inspect.cleandoc(
+        """
+        以下の4つの質問について、順を追って詳細に、分かりやすく答えてください。
+
+        1. 既存研究では何ができなかったのか
+        2. どのようなアプローチでそれを解決しようとしたか
+        3. 結果、何が達成できたのか
+        4. 今後の課題は何か
+        """
+    )
+
+    SYSTEM_MESSAGE_PREFIX, SYSTEM_MESSAGE_SUFFIX = inspect.cleandoc(
+        """
+        以下のテキストは、ある論文(PDF)をOCRで文章抽出したものです。
+        OCRモデルの精度は確約されていないため、文章の一部が抽出されていない可能性があります。
+        また、論文の構造によっては、本文以外の部分が抽出されている可能性があります。
+        それを踏まえた上で、以下の文章を理解し、ユーザーの質問に答えてください。
+
+        '''
+        {text}
+        '''
+        """
+    ).split("{text}")
+
+    def __init__(
+        self,
+        count_tokens: Optional[Callable[[str], int]] = None,
+        min_header_repeats: int = 3,
+        max_header_length: int = 80,
+    ) -> None:
+        """
+        Initialize the PromptBuilder.
+
+        Parameters
+        ----------
+        count_tokens : Optional[Callable[[str], int]], default=None
+            The function to count the tokens of a text.
+            If None, whitespace-separated words are counted instead.
+        min_header_repeats : int, default=3
+            The minimum number of occurrences for a short line to be
+            regarded as a running header or footer.
+        max_header_length : int, default=80
+            The maximum number of characters of a running header or
+            footer.
+        """
+        self.count_tokens = count_tokens or (lambda text: len(text.split()))
+        self.min_header_repeats = min_header_repeats
+        self.max_header_length = max_header_length
+
+    def build(self, text: str) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for the given text.
+
+        Parameters
+        ----------
+        text : str
+            The text, already compacted, to be embedded in the system
+            message.
+
+        Returns
+        -------
+        List[Dict[str, str]]
+            The system and user messages.
+        """
+        return [
+            {
+                "role": "system",
+                "content": self.SYSTEM_MESSAGE_PREFIX + text + self.SYSTEM_MESSAGE_SUFFIX,
+            },
+            {"role": "user", "content": self.USER_PROMPT},
+        ]
+
+    def compact(self, text: str) -> CompactedText:
+        """
+        Normalize and compact the text extracted by OCR.
+        Running headers and footers are removed, and whitespace is
+        collapsed. Hyphenated line breaks are already joined by OCRModel,
+        which knows where the lines of a block end.
+
+        Parameters
+        ----------
+        text : str
+            The text extracted by OCR.
+
+        Returns
+        -------
+        CompactedText
+            The compacted text and its token counts before and after.
+        """
+        lines = [re.sub(r"\s+", " ", line).strip() for line in text.split("\n")]
+        lines = [line for line in lines if line]
+
+        # short lines which appear on many pages are running headers,
+        # footers or watermarks, so keep only the first occurrence
+        counts = Counter(lines)
+        seen = set()
+        compacted_lines = []
+        for line in lines:
+            if (
+                counts[line] >= self.min_header_repeats
+                and len(line) <= self.max_header_length
+            ):
+                if line in seen:
+                    continue
+                seen.add(line)
+            compacted_lines.append(line)
+
+        compacted = "\n".join(compacted_lines)
+
+        return CompactedText(
+            text=compacted,
+            original_tokens=self.count_tokens(text),
+            compacted_tokens=self.count_tokens(compacted),
+        )
@@ -0,0 +1,235 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Deque, Dict, Iterable, Iterator, Optional
+
+from ._schema import LatencyStats, RequestStats
+
+
+class Priority(IntEnum):
+    """
+    The priority classes of the work run through the pipeline.
+    A smaller value is served first.
+    """
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class PriorityScheduler:
+    """
+    A class to share the pipeline stages between interactive requests
+    and the daily batch.
+    Work acquires a slot for each unit of a stage (a page for OCR, a
+    paper for summarization) and releases it at the stage boundary, so
+    that waiting interactive work is granted the next free slot before
+    any batch work.
+
+    Attributes
+    ----------
+    max_concurrency : int
+        The maximum number of slots held at the same time.
+    shares : Dict[Priority, int]
+        The maximum number of slots each priority class may hold at the
+        same time.
+    max_samples : int
+        The maximum number of the latest samples kept per priority class
+        for the statistics.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 1,
+        shares: Optional[Dict[Priority, int]] = None,
+        max_samples: int = 10000,
+    ) -> None:
+        """
+        Initialize the PriorityScheduler.
+
+        Parameters
+        ----------
+        max_concurrency : int, default=1
+            The maximum number of slots held at the same time.
+            The OCR models are not thread-safe, so it should be 1 unless
+            each slot has its own models.
+        shares : Optional[Dict[Priority, int]], default=None
+            The maximum number of slots each priority class may hold at
+            the same time. If None, every class may use all of the slots.
+        max_samples : int, default=10000
+            The maximum number of the latest samples kept per priority
+            class for the statistics, so that the memory stays bounded.
+        """
+        self.max_concurrency = max_concurrency
+        self.max_samples = max_samples
+        self.shares = {
+            priority: max_concurrency for priority in Priority
+        }
+        self.shares.update(shares or {})
+
+        self.__condition = threading.Condition()
+        self.__running = {priority: 0 for priority in Priority}
+        self.__waiting = {priority: 0 for priority in Priority}
+        self.__wait_times: Dict[Priority, Deque[float]] = {
+            priority: deque(maxlen=max_samples) for priority in Priority
+        }
+        self.__run_times: Dict[Priority, Deque[float]] = {
+            priority: deque(maxlen=max_samples) for priority in Priority
+        }
+
+    @contextmanager
+    def slot(self, priority: Priority) -> Iterator[None]:
+        """
+        Hold a slot of the pipeline while in the context.
+
+        Parameters
+        ----------
+        priority : Priority
+            The priority class of the work.
+        """
+        requested_at = time.perf_counter()
+        with self.__condition:
+            self.__waiting[priority] += 1
+            self.__condition.wait_for(lambda: self.__can_run(priority))
+            self.__waiting[priority] -= 1
+            self.__running[priority] += 1
+
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            finished_at = time.perf_counter()
+            with self.__condition:
+                self.__running[priority] -= 1
+                self.__wait_times[priority].append(started_at - requested_at)
+                self.__run_times[priority].append(finished_at - started_at)
+                self.__condition.notify_all()
+
+    def stats(self, reset: Iterable[Priority] = ()) -> Dict[Priority, LatencyStats]:
+        """
+        Get the latency statistics of each priority class.
+
+        Parameters
+        ----------
+        reset : Iterable[Priority], default=()
+            The priority classes whose samples are cleared after getting
+            the statistics, so that their next statistics cover only the
+            work since then.
+
+        Returns
+        -------
+        Dict[Priority, LatencyStats]
+            The latency statistics of each priority class.
+        """
+        with self.__condition:
+            stats = {
+                priority: LatencyStats.from_samples(
+                    list(self.__wait_times[priority]),
+                    list(self.__run_times[priority]),
+                )
+                for priority in Priority
+            }
+            for priority in reset:
+                self.__wait_times[priority].clear()
+                self.__run_times[priority].clear()
+            return stats
+
+    def __can_run(self, priority: Priority) -> bool:
+        """
+        Check if work of the given priority class can take a slot now.
+
+        Parameters
+        ----------
+        priority : Priority
+            The priority class of the work.
+
+        Returns
+        -------
+        bool
+            True if the work can take a slot, False otherwise.
+        """
+        if sum(self.__running.values()) >= self.max_concurrency:
+            return False
+        if self.__running[priority] >= self.shares[priority]:
+            return False
+
+        # work of a higher priority class is served first
+        return not any(
+            self.__waiting[other] > 0
+            and self.__running[other] < self.shares[other]
+            for other in Priority
+            if other < priority
+        )
+
+
+class LatencyRecorder:
+    """
+    A class to record the end-to-end latency of the requests of each
+    priority class, e.g. from a mention until its summary is posted,
+    which spans many slots of the pipeline stages.
+
+    Attributes
+    ----------
+    max_samples : int
+        The maximum number of the latest samples kept per priority class.
+    """
+
+    def __init__(self, max_samples: int = 10000) -> None:
+        """
+        Initialize the LatencyRecorder.
+
+        Parameters
+        ----------
+        max_samples : int, default=10000
+            The maximum number of the latest samples kept per priority
+            class, so that the memory stays bounded.
+        """
+        self.max_samples = max_samples
+
+        self.__lock = threading.Lock()
+        self.__latencies: Dict[Priority, Deque[float]] = {
+            priority: deque(maxlen=max_samples) for priority in Priority
+        }
+
+    @contextmanager
+    def measure(self, priority: Priority) -> Iterator[None]:
+        """
+        Record the time spent in the context as the latency of a request.
+
+        Parameters
+        ----------
+        priority : Priority
+            The priority class of the request.
+        """
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            latency = time.perf_counter() - started_at
+            with self.__lock:
+                self.__latencies[priority].append(latency)
+
+    def stats(self, reset: Iterable[Priority] = ()) -> Dict[Priority, RequestStats]:
+        """
+        Get the latency statistics of each priority class.
+
+        Parameters
+        ----------
+        reset : Iterable[Priority], default=()
+            The priority classes whose samples are cleared after getting
+            the statistics.
+
+        Returns
+        -------
+        Dict[Priority, RequestStats]
+            The latency statistics of each priority class.
+        """
+        with self.__lock:
+            stats = {
+                priority: RequestStats.from_samples(list(self.__latencies[priority]))
+                for priority in Priority
+            }
+            for priority in reset:
+                self.__latencies[priority].clear()
+            return stats
@@ -1,5 +1,7 @@
+import math
 from dataclasses import dataclass
 from pathlib import Path
+from typing import List, Optional
 
 
 @dataclass(frozen=True)
@@ -41,3 +43,275 @@ class SlackMessageData:
     title: str
     url: str
     summary: str
+
+
+@dataclass(frozen=True)
+class CompactedText:
+    """
+    A class to represent the text compacted to be embedded in a prompt.
+
+    Attributes
+    ----------
+    text : str
+        The compacted text.
+    original_tokens : int
+        The number of tokens of the text before compaction.
+    compacted_tokens : int
+        The number of tokens of the text after compaction.
+    """
+
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        """
+        The number of tokens saved by compaction.
+        """
+        return self.original_tokens - self.compacted_tokens
+
+
+@dataclass(frozen=True)
+class LatencyStats:
+    """
+    A class to represent the latency statistics of a priority class.
+
+    Attributes
+    ----------
+    count : int
+        The number of slots granted.
+    mean_wait : float
+        The mean time in seconds waited for a slot.
+    p95_wait : float
+        The 95th percentile of the time in seconds waited for a slot.
+    max_wait : float
+        The maximum time in seconds waited for a slot.
+    mean_run : float
+        The mean time in seconds a slot was held.
+    """
+
+    count: int
+    mean_wait: float
+    p95_wait: float
+    max_wait: float
+    mean_run: float
+
+    @classmethod
+    def from_samples(
+        cls, wait_times: List[float], run_times: List[float]
+    ) -> "LatencyStats":
+        """
+        Create the statistics from the measured times.
+
+        Parameters
+        ----------
+        wait_times : List[float]
+            The times in seconds waited for a slot.
+        run_times : List[float]
+            The times in seconds a slot was held.
+
+        Returns
+        -------
+        LatencyStats
+            The latency statistics.
+        """
+        if not wait_times:
+            return cls(count=0, mean_wait=0.0, p95_wait=0.0, max_wait=0.0, mean_run=0.0)
+
+        sorted_wait_times = sorted(wait_times)
+        return cls(
+            count=len(wait_times),
+            mean_wait=sum(wait_times) / len(wait_times),
+            p95_wait=sorted_wait_times[math.ceil(0.95 * len(sorted_wait_times)) - 1],
+            max_wait=sorted_wait_times[-1],
+            mean_run=sum(run_times) / len(run_times),
+        )
+
+
+@dataclass(frozen=True)
+class RequestStats:
+    """
+    A class to represent the end-to-end latency statistics of the
+    requests of a priority class.
+
+    Attributes
+    ----------
+    count : int
+        The number of requests.
+    mean : float
+        The mean latency in seconds.
+    p50 : float
+        The median latency in seconds.
+    p95 : float
+        The 95th percentile of the latency in seconds.
+    max : float
+        The maximum latency in seconds.
+    """
+
+    count: int
+    mean: float
+    p50: float
+    p95: float
+    max: float
+
+    @classmethod
+    def from_samples(cls, latencies: List[float]) -> "RequestStats":
+        """
+        Create the statistics from the measured latencies.
+
+        Parameters
+        ----------
+        latencies : List[float]
+            The latencies in seconds.
+
+        Returns
+        -------
+        RequestStats
+            The latency statistics.
+        """
+        if not latencies:
+            return cls(count=0, mean=0.0, p50=0.0, p95=0.0, max=0.0)
+
+        sorted_latencies = sorted(latencies)
+        return cls(
+            count=len(latencies),
+            mean=sum(latencies) / len(latencies),
+            p50=sorted_latencies[math.ceil(0.5 * len(sorted_latencies)) - 1],
+            p95=sorted_latencies[math.ceil(0.95 * len(sorted_latencies)) - 1],
+            max=sorted_latencies[-1],
+        )
+
+
+@dataclass(frozen=True)
+class WorkerStats:
+    """
+    A class to represent the statistics of an OCR worker.
+
+    Attributes
+    ----------
+    worker_id : int
+        The ID of the worker.
+    pid : Optional[int]
+        The process ID of the worker, or None if it is stopped.
+    rss_mb : float
+        The resident set size of the worker in MB.
+    pages_processed : int
+        The number of pages processed by the current process.
+    restarts : int
+        The number of times the process has been replaced.
+    """
+
+    worker_id: int
+    pid: Optional[int]
+    rss_mb: float
+    pages_processed: int
+    restarts: int
+
+
+@dataclass(frozen=True)
+class SourceResult:
+    """
+    A class to represent the result of a source of arXiv IDs.
+
+    Attributes
+    ----------
+    source : str
+        The name of the source.
+    arxiv_ids : List[str]
+        The arXiv IDs fetched from the source.
+    elapsed : float
+        The time in seconds taken to fetch the source.
+    error : Optional[str]
+        The error raised while fetching the source, or None if it
+        succeeded.
+    """
+
+    source: str
+    arxiv_ids: List[str]
+    elapsed: float
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ArchivedPaper:
+    """
+    A class to represent a summarized paper stored in the archive.
+
+    Attributes
+    ----------
+    arxiv_id : str
+        The arXiv ID of the paper.
+    title : str
+        The title of the paper.
+    abstract : str
+        The abstract of the paper.
+    text : str
+        The text summarized, extracted by OCR or the abstract.
+    summary : str
+        The summary of the paper.
+    url : str
+        The URL of the paper.
+    created_at : str
+        The time the paper was stored, in ISO 8601 format.
+    """
+
+    arxiv_id: str
+    title: str
+    abstract: str
+    text: str
+    summary: str
+    url: str
+    created_at: str
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """
+    A class to represent a paper matching a search query.
+
+    Attributes
+    ----------
+    arxiv_id : str
+        The arXiv ID of the paper.
+    title : str
+        The title of the paper.
+    url : str
+        The URL of the paper.
+    snippet : str
+        The excerpt of the paper around the matched words.
+    score : float
+        The BM25 score of the paper. The smaller, the more relevant.
+    """
+
+    arxiv_id: str
+    title: str
+    url: str
+    snippet: str
+    score: float
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """
+    A class to represent a page of the results of a search query.
+
+    Attributes
+    ----------
+    query : str
+        The search query.
+    page : int
+        The 1-based page number.
+    per_page : int
+        The number of results per page.
+    total : int
+        The total number of the matched papers.
+    hits : List[SearchHit]
+        The matched papers in the page.
+    """
+
+    query: str
+    page: int
+    per_page: int
+    total: int
+    hits: List[SearchHit]
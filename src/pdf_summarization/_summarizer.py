@@ -1,7 +1,10 @@
-import inspect
 import os
+from typing import Optional
 
 import openai
+from transformers import GPT2Tokenizer
+
+from ._prompt_builder import PromptBuilder
 
 
 class Summarizer:
@@ -12,8 +15,19 @@ class Summarizer:
     ----------
     model : str
         The OpenAI model to be used for summarization.
+    max_length : int
+        The maximum token length of the text to handle with OpenAI API.
+    tokenizer : GPT2Tokenizer
+        The GPT2Tokenizer instance to calculate the token length.
+    prompt_builder : PromptBuilder
+        The PromptBuilder instance to compact the text and build the
+        messages.
     """
-    def __init__(self, model: str = "gpt-3.5-turbo-16k-0613") -> None:
+    def __init__(
+        self,
+        model: str = "gpt-3.5-turbo-16k-0613",
+        max_length: int = 16000,
+    ) -> None:
         """
         Initialize the Summarizer class with an OCRModel instance and set the OpenAI API key.
 
@@ -22,79 +36,72 @@ class Summarizer:
         model : str, optional
             The OpenAI model to be used for summarization,
             by default "gpt-3.5-turbo-16k-0613"
+        max_length : int, optional
+            The maximum token length of the text to handle with OpenAI API,
+            by default 16000
         """
         self.model = model
+        self.max_length = max_length
+        self.tokenizer = GPT2Tokenizer.from_pretrained("gpt2")
+        self.prompt_builder = PromptBuilder(count_tokens=self.count_tokens)
 
         openai.organization = os.getenv("OPENAI_ORGANIZATION", "")
         openai.api_key = os.getenv("OPENAI_API_KEY")
 
-    @property
-    def __user_prompt(self) -> str:
+    def count_tokens(self, text: str) -> int:
         """
-        Returns a formatted user prompt string.
+        Count the number of tokens of a text.
 
-        Returns
-        -------
-        str
-            The user prompt string.
-        """
-        return inspect.cleandoc(
-            """
-            以下の4つの質問について、順を追って詳細に、分かりやすく答えてください。
-
-            1. 既存研究では何ができなかったのか
-            2. どのようなアプローチでそれを解決しようとしたか
-            3. 結果、何が達成できたのか
-            4. 今後の課題は何か
-            """
-        )
-
-    @property
-    def __system_message_format(self) -> str:
-        """
-        Returns a formatted system message string.
+        Parameters
+        ----------
+        text : str
+            The text to count the tokens of.
 
         Returns
         -------
-        str
-            The system message string.
+        int
+            The number of tokens.
         """
-        return inspect.cleandoc(
-            """
-            以下のテキストは、ある論文(PDF)をOCRで文章抽出したものです。
-            OCRモデルの精度は確約されていないため、文章の一部が抽出されていない可能性があります。
-            また、論文の構造によっては、本文以外の部分が抽出されている可能性があります。
-            それを踏まえた上で、以下の文章を理解し、ユーザーの質問に答えてください。
+        return len(self.tokenizer(text)["input_ids"])
 
-            '''
-            {text}
-            '''
-            """
-        )
-
-    def summarize(self, text: str) -> str:
+    def summarize(self, text: str, fallback: Optional[str] = None) -> str:
         """
         Summarize the given text using OpenAI's language model.
+        The text is compacted first, and if it is still too long or
+        empty, the fallback text is summarized instead.
 
         Parameters
         ----------
         text : str
             The text to be summarized.
+        fallback : Optional[str], optional
+            The text to be summarized instead (e.g. the abstract),
+            by default None
 
         Returns
         -------
         str
             The summarized text.
         """
+        compacted = self.prompt_builder.compact(text)
+        print(
+            f"Compacted the text from {compacted.original_tokens} to "
+            f"{compacted.compacted_tokens} tokens "
+            f"({compacted.tokens_saved} tokens saved)."
+        )
+        if fallback is not None and (
+            not compacted.text
+            or compacted.compacted_tokens > self.max_length - 2000
+        ):
+            compacted = self.prompt_builder.compact(fallback)
+            print(
+                "The text is too long or empty, so summarizing the fallback "
+                f"of {compacted.compacted_tokens} tokens instead."
+            )
+
         response = openai.ChatCompletion.create(
             model=self.model,
             max_tokens=2000,
-            messages=[
-                {
-                    "role": "system",
-                    "content": self.__system_message_format.format(text=text),
-                },
-                {"role": "user", "content": self.__user_prompt},
-            ],
+            messages=self.prompt_builder.build(compacted.text),
         )
         return response["choices"][0]["message"]["content"]
@@ -1,8 +1,14 @@
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence
+
+from ._archive import SummaryArchive
 from ._arxiv import Arxiv
 from ._id_retriever import IDRetriever
-from ._ocr_model import OCRModel
+from ._inference_backend import InferenceBackend
+from ._ocr_worker import OCRWorkerPool
 from ._post_to_slack import post_to_slack
-from ._schema import SlackMessageData
+from ._scheduler import LatencyRecorder, Priority, PriorityScheduler
+from ._schema import LatencyStats, RequestStats, SlackMessageData
 from ._summarizer import Summarizer
 
 
@@ -13,16 +19,49 @@ class APIInterface:
 
     Attributes
     ----------
-    ocr_model : OCRModel
-        The OCRModel instance, which uses the PadddleOCR.
+    ocr_model : OCRWorkerPool
+        The OCRWorkerPool instance, which runs the PadddleOCR in
+        supervised worker processes.
     summarizer : Summarizer
         The Summarizer instance, which uses the OpenAI API.
+    ocr_scheduler : PriorityScheduler
+        The scheduler which pages are extracted through.
+    summary_scheduler : PriorityScheduler
+        The scheduler which papers are summarized through.
+    request_recorder : LatencyRecorder
+        The recorder of the end-to-end latency of each mention and each
+        paper of the daily batch.
+    id_retriever : IDRetriever
+        The IDRetriever instance to retrieve the daily papers.
+    archive : SummaryArchive
+        The SummaryArchive instance to store the summarized papers.
     """
 
-    def __init__(self, model: str = "gpt-3.5-turbo-16k-0613", max_length: int = 16000):
+    def __init__(
+        self,
+        model: str = "gpt-3.5-turbo-16k-0613",
+        max_length: int = 16000,
+        ocr_concurrency: int = 1,
+        batch_ocr_share: int = 1,
+        summary_concurrency: int = 2,
+        batch_summary_share: int = 1,
+        recycle_pages: int = 200,
+        recycle_rss_mb: float = 4096,
+        max_rss_mb: float = 6144,
+        id_sources: Sequence[str] = ("hf",),
+        inference_backend: Optional[InferenceBackend] = None,
+        archive_path: Path = Path("./summaries.db"),
+        ocr_scheduler: Optional[PriorityScheduler] = None,
+        ocr_model: Optional[OCRWorkerPool] = None,
+        summarizer: Optional[Summarizer] = None,
+        id_retriever: Optional[IDRetriever] = None,
+        archive: Optional[SummaryArchive] = None,
+    ):
         """
         Initialize the APIInterface with OCRModel and Summarizer
         instances.
+        The components can be given instead of being created from the
+        parameters, e.g. stubbed ones for load testing.
 
         Parameters
         ----------
@@ -32,43 +71,139 @@ class APIInterface:
         max_length : int, optional
             The maximum length of the text to be summarized,
             by default 16000
+        ocr_concurrency : int, optional
+            The number of OCR worker processes, each of which extracts
+            a page at a time, by default 1
+        batch_ocr_share : int, optional
+            The maximum number of pages of the daily batch extracted at
+            the same time, by default 1
+        summary_concurrency : int, optional
+            The maximum number of papers summarized at the same time,
+            by default 2
+        batch_summary_share : int, optional
+            The maximum number of papers of the daily batch summarized
+            at the same time, by default 1
+        recycle_pages : int, optional
+            The number of pages after which an OCR worker is recycled,
+            by default 200
+        recycle_rss_mb : float, optional
+            The RSS in MB above which an OCR worker is recycled,
+            by default 4096
+        max_rss_mb : float, optional
+            The memory ceiling in MB at which an OCR worker is killed
+            and its page retried on a fresh worker, by default 6144
+        id_sources : Sequence[str], optional
+            The names of the sources to retrieve the daily papers from,
+            by default ("hf",)
+        inference_backend : Optional[InferenceBackend], optional
+            The inference backend of the OCR models. If None, it is read
+            from the environment variables, by default None
+        archive_path : Path, optional
+            The path of the SQLite database to store the summarized
+            papers, by default Path("./summaries.db")
+        ocr_scheduler : Optional[PriorityScheduler], optional
+            The scheduler which pages are extracted through. If None, it
+            is created from ocr_concurrency and batch_ocr_share,
+            by default None
+        ocr_model : Optional[OCRWorkerPool], optional
+            The OCR model, which should extract pages through
+            ocr_scheduler. If None, an OCRWorkerPool is created,
+            by default None
+        summarizer : Optional[Summarizer], optional
+            The summarizer. If None, it is created from model and
+            max_length, by default None
+        id_retriever : Optional[IDRetriever], optional
+            The retriever of the daily papers. If None, it is created
+            from id_sources, by default None
+        archive : Optional[SummaryArchive], optional
+            The archive of the summarized papers. If None, it is created
+            at archive_path, by default None
         """
-        self.ocr_model = OCRModel(max_length=max_length)
-        self.summarizer = Summarizer(model=model)
+        # interactive mentions preempt the daily batch between pages
+        # for OCR and between papers for summarization
+        self.ocr_scheduler = ocr_scheduler or PriorityScheduler(
+            max_concurrency=ocr_concurrency,
+            shares={Priority.BATCH: batch_ocr_share},
+        )
+        self.summary_scheduler = PriorityScheduler(
+            max_concurrency=summary_concurrency,
+            shares={Priority.BATCH: batch_summary_share},
+        )
+        self.request_recorder = LatencyRecorder()
+
+        self.ocr_model = ocr_model or OCRWorkerPool(
+            scheduler=self.ocr_scheduler,
+            num_workers=ocr_concurrency,
+            recycle_pages=recycle_pages,
+            recycle_rss_mb=recycle_rss_mb,
+            max_rss_mb=max_rss_mb,
+            backend=inference_backend or InferenceBackend.from_env(),
+        )
+        self.id_retriever = id_retriever or IDRetriever(sources=id_sources)
+        self.archive = archive or SummaryArchive(archive_path)
+        self.summarizer = summarizer or Summarizer(model=model, max_length=max_length)
 
     def summarize(self, arxiv_id_or_url: str) -> None:
         """
         Summarize the text of a research paper given its arXiv ID or
         URL.
         Then, post summarized text of the research paper.
+        If the paper has already been summarized, the archived summary
+        is posted instead.
 
         Parameters
         ----------
         arxiv_id_or_url : str
             The arXiv ID or URL of the research paper.
         """
-        # 1. Download the paper from arXiv
-        print("Downloading the paper...")
-        arxiv_info = Arxiv.download(arxiv_id_or_url)
+        # measure the whole request, since a mention waits for a slot
+        # of each page and of the summary
+        with self.request_recorder.measure(Priority.INTERACTIVE):
+            arxiv_id = arxiv_id_or_url.split("/")[-1]
+            archived_paper = self.archive.get(arxiv_id)
+            if archived_paper is not None:
+                print("Found the paper in the archive.")
+                post_to_slack(
+                    [
+                        SlackMessageData(
+                            title=archived_paper.title,
+                            url=archived_paper.url,
+                            summary=archived_paper.summary,
+                        )
+                    ]
+                )
+                return
 
-        # 2. Extract text from the paper
-        print("Extracting text from the paper...")
-        text = self.ocr_model.extract_text(arxiv_info.path) or arxiv_info.abstract
+            # 1. Download the paper from arXiv
+            print("Downloading the paper...")
+            arxiv_info = Arxiv.download(arxiv_id_or_url)
 
-        # 3. Summarize the text
-        print("Summarizing the text...")
-        summary = self.summarizer.summarize(text)
+            # 2. Extract text from the paper
+            print("Extracting text from the paper...")
+            text = self.ocr_model.extract_text(arxiv_info.path, Priority.INTERACTIVE)
 
-        # 4. Post the summary to Slack
-        post_to_slack(
-            [
-                SlackMessageData(
-                    title=arxiv_info.title,
-                    url=f"https://arxiv.org/abs/{arxiv_id_or_url}",
-                    summary=summary,
-                )
-            ]
-        )
+            # 3. Summarize the text
+            print("Summarizing the text...")
+            with self.summary_scheduler.slot(Priority.INTERACTIVE):
+                summary = self.summarizer.summarize(text, fallback=arxiv_info.abstract)
+            archived_paper = self.archive.add(
+                arxiv_id=arxiv_id,
+                title=arxiv_info.title,
+                abstract=arxiv_info.abstract,
+                text=text or arxiv_info.abstract,
+                summary=summary,
+            )
+
+            # 4. Post the summary to Slack
+            post_to_slack(
+                [
+                    SlackMessageData(
+                        title=archived_paper.title,
+                        url=archived_paper.url,
+                        summary=archived_paper.summary,
+                    )
+                ]
+            )
 
     def daily_summary(self) -> None:
         """
@@ -77,23 +212,95 @@ class APIInterface:
         papers to slack.
         """
         # 1. Retrieve arXiv IDs
-        arxiv_ids = IDRetriever.retrieve_from_hf()
+        arxiv_ids = self.id_retriever.retrieve()
 
         # 2. Summarize each paper and concatenate them
         summaries = []
         for arxiv_id in arxiv_ids:
-            arxiv_info = Arxiv.download(arxiv_id)
-            summary = self.summarizer.summarize(
-                self.ocr_model.extract_text(arxiv_info.path) or arxiv_info.abstract
-            )
+            archived_paper = self.archive.get(arxiv_id)
+            if archived_paper is None:
+                with self.request_recorder.measure(Priority.BATCH):
+                    arxiv_info = Arxiv.download(arxiv_id)
+                    text = self.ocr_model.extract_text(arxiv_info.path, Priority.BATCH)
+                    with self.summary_scheduler.slot(Priority.BATCH):
+                        summary = self.summarizer.summarize(
+                            text, fallback=arxiv_info.abstract
+                        )
+                    archived_paper = self.archive.add(
+                        arxiv_id=arxiv_id,
+                        title=arxiv_info.title,
+                        abstract=arxiv_info.abstract,
+                        text=text or arxiv_info.abstract,
+                        summary=summary,
+                    )
 
             summaries.append(
                 SlackMessageData(
-                    title=arxiv_info.title,
-                    url=f"https://arxiv.org/abs/{arxiv_id}",
-                    summary=summary,
+                    title=archived_paper.title,
+                    url=archived_paper.url,
+                    summary=archived_paper.summary,
                 )
             )
 
         # 3. Post to Slack
         post_to_slack(summaries)
+
+        # report the statistics of this batch, and leave the samples of
+        # the mentions to be read through the API
+        for stage, stats in self.latency_stats(reset=(Priority.BATCH,)).items():
+            stat = stats[Priority.BATCH]
+            print(
+                f"[{stage}/batch] count={stat.count} "
+                f"mean_wait={stat.mean_wait:.2f}s p95_wait={stat.p95_wait:.2f}s "
+                f"max_wait={stat.max_wait:.2f}s mean_run={stat.mean_run:.2f}s"
+            )
+        stat = self.request_stats(reset=(Priority.BATCH,))[Priority.BATCH]
+        print(
+            f"[paper/batch] count={stat.count} mean={stat.mean:.2f}s "
+            f"p50={stat.p50:.2f}s p95={stat.p95:.2f}s max={stat.max:.2f}s"
+        )
+
+    def latency_stats(
+        self, reset: Iterable[Priority] = ()
+    ) -> Dict[str, Dict[Priority, LatencyStats]]:
+        """
+        Get the latency statistics of the slots of each stage and
+        priority class.
+
+        Parameters
+        ----------
+        reset : Iterable[Priority], optional
+            The priority classes whose samples are cleared after getting
+            the statistics, by default ()
+
+        Returns
+        -------
+        Dict[str, Dict[Priority, LatencyStats]]
+            The latency statistics keyed by the stage name, then by the
+            priority class.
+        """
+        reset = tuple(reset)
+        return {
+            "ocr": self.ocr_scheduler.stats(reset=reset),
+            "summarization": self.summary_scheduler.stats(reset=reset),
+        }
+
+    def request_stats(
+        self, reset: Iterable[Priority] = ()
+    ) -> Dict[Priority, RequestStats]:
+        """
+        Get the end-to-end latency statistics of the mentions and the
+        papers of the daily batch.
+
+        Parameters
+        ----------
+        reset : Iterable[Priority], optional
+            The priority classes whose samples are cleared after getting
+            the statistics, by default ()
+
+        Returns
+        -------
+        Dict[Priority, RequestStats]
+            The latency statistics keyed by the priority class.
+        """
+        return self.request_recorder.stats(reset=reset)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# import the package as `src.pdf_summarization`, in the same way as app.py
+sys.path.append(str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,104 @@
+import sqlite3
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from src.pdf_summarization._archive import SummaryArchive
+
+
+@pytest.fixture
+def archive(tmp_path: Path) -> Iterator[SummaryArchive]:
+    archive = SummaryArchive(path=tmp_path / "summaries.db")
+    archive.add(
+        arxiv_id="2401.12345",
+        title="Fast Diffusion Models",
+        abstract="We accelerate the sampling of diffusion models.",
+        text="",
+        summary="既存研究では拡散モデルの高速化ができなかった。",
+    )
+    archive.add(
+        arxiv_id="2401.54321",
+        title="Large Language Models",
+        abstract="We scale language models.",
+        text="",
+        summary="大規模言語モデルのスケーリング則を調べた。",
+    )
+    yield archive
+    archive.close()
+
+
+@pytest.mark.parametrize("query", ["拡散モデル", "既存研究", "高速化 できなかった"])
+def test_search_japanese(archive: SummaryArchive, query: str) -> None:
+    result = archive.search(query)
+    assert result.total == 1
+    assert [hit.arxiv_id for hit in result.hits] == ["2401.12345"]
+
+
+@pytest.mark.parametrize("query", ["拡散", "拡散モデル 既存", "diffusion"])
+def test_search_short_words(archive: SummaryArchive, query: str) -> None:
+    # words shorter than a trigram are matched with LIKE
+    result = archive.search(query)
+    assert result.total == 1
+    assert [hit.arxiv_id for hit in result.hits] == ["2401.12345"]
+
+
+def test_search_ignores_query_syntax(archive: SummaryArchive) -> None:
+    for query in ['"', "OR", "models AND", "%", "_", "NEAR(a b)"]:
+        archive.search(query)
+
+    assert archive.search("models").total == 2
+    assert archive.search("%").total == 0
+
+
+def test_search_pages(archive: SummaryArchive) -> None:
+    result = archive.search("models", page=2, per_page=1)
+    assert result.total == 2
+    assert len(result.hits) == 1
+
+
+def test_rebuild_unicode61_index(tmp_path: Path) -> None:
+    path = tmp_path / "summaries.db"
+    archive = SummaryArchive(path=path)
+    archive.add(
+        arxiv_id="2401.12345",
+        title="Fast Diffusion Models",
+        abstract="",
+        text="",
+        summary="既存研究では拡散モデルの高速化ができなかった。",
+    )
+    archive.close()
+
+    # recreate the index as an older version built it
+    conn = sqlite3.connect(str(path))
+    with conn:
+        conn.execute("DROP TABLE papers_fts")
+        conn.execute(
+            "CREATE VIRTUAL TABLE papers_fts USING fts5("
+            "title, abstract, text, summary, content='papers', content_rowid='rowid')"
+        )
+        conn.execute("INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')")
+    conn.close()
+
+    archive = SummaryArchive(path=path)
+    assert archive.search("拡散モデル").total == 1
+    archive.close()
+
+
+@pytest.mark.parametrize("query", ["拡散モデル", "既存研究 拡散", "diffusion models"])
+def test_search_without_trigram(tmp_path: Path, monkeypatch, query: str) -> None:
+    # SQLite older than 3.34 has no trigram tokenizer
+    monkeypatch.setattr(sqlite3, "sqlite_version_info", (3, 22, 0))
+    archive = SummaryArchive(path=tmp_path / "summaries.db")
+    archive.add(
+        arxiv_id="2401.12345",
+        title="Fast Diffusion Models",
+        abstract="",
+        text="",
+        summary="既存研究では拡散モデルの高速化ができなかった。",
+    )
+
+    result = archive.search(query)
+    assert result.total == 1
+    assert [hit.arxiv_id for hit in result.hits] == ["2401.12345"]
+    archive.close()
@@ -0,0 +1,103 @@
+from datetime import date
+from pathlib import Path
+from typing import Iterator, List
+
+from src.pdf_summarization._id_retriever import (
+    ArxivListingSource,
+    ArxivRSSSource,
+    HFDailyPapersSource,
+    IDRetriever,
+    IDSource,
+    LocalFileSource,
+    register_source,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def read_chunks(name: str, chunk_size: int = 7) -> Iterator[str]:
+    # feed small chunks so that tags are split across chunks, as when
+    # streaming a response
+    text = (FIXTURES_DIR / name).read_text()
+    for i in range(0, len(text), chunk_size):
+        yield text[i : i + chunk_size]
+
+
+def test_hf_daily_papers_parse() -> None:
+    # only the links in the articles are the daily papers
+    assert HFDailyPapersSource.parse(read_chunks("hf_papers.html")) == [
+        "2401.12345",
+        "2401.12345",
+        "2401.54321",
+        "2401.54321",
+    ]
+
+
+def test_hf_daily_papers_fetch_uses_the_day_of_each_fetch(monkeypatch) -> None:
+    urls = []
+    monkeypatch.setattr(
+        HFDailyPapersSource,
+        "_stream",
+        staticmethod(lambda session, url: urls.append(url) or []),
+    )
+
+    HFDailyPapersSource().fetch(session=None)
+    HFDailyPapersSource(day=date(2024, 1, 15)).fetch(session=None)
+
+    assert urls == [
+        f"https://huggingface.co/papers?date={date.today().strftime('%Y-%m-%d')}",
+        "https://huggingface.co/papers?date=2024-01-15",
+    ]
+
+
+def test_arxiv_listing_parse() -> None:
+    assert ArxivListingSource.parse(read_chunks("arxiv_listing.html")) == [
+        "2401.07001",
+        "2401.07002",
+    ]
+
+
+def test_arxiv_rss_parse() -> None:
+    assert ArxivRSSSource.parse(read_chunks("arxiv_rss.xml")) == [
+        "2401.08001",
+        "2401.08002",
+    ]
+
+
+def test_local_file_fetch() -> None:
+    source = LocalFileSource(
+        paths=[FIXTURES_DIR / "arxiv_ids.txt", FIXTURES_DIR / "missing.txt"]
+    )
+    assert source.fetch(session=None) == ["2401.09001", "2401.09002"]
+
+
+@register_source("test_fixtures")
+class FixturesSource(IDSource):
+    def fetch(self, session) -> List[str]:
+        return HFDailyPapersSource.parse(read_chunks("hf_papers.html"))
+
+
+@register_source("test_failing")
+class FailingSource(IDSource):
+    def fetch(self, session) -> List[str]:
+        raise ConnectionError("unreachable")
+
+
+def test_retrieve_merges_and_deduplicates() -> None:
+    retriever = IDRetriever(
+        sources=("test_fixtures", "file", "test_failing"),
+        file={"paths": [FIXTURES_DIR / "arxiv_ids.txt"]},
+    )
+
+    assert retriever.retrieve() == [
+        "2401.12345",
+        "2401.54321",
+        "2401.09001",
+        "2401.09002",
+    ]
+    assert [result.source for result in retriever.results] == [
+        "test_fixtures",
+        "file",
+        "test_failing",
+    ]
+    assert retriever.results[2].error is not None
@@ -0,0 +1,32 @@
+import pytest
+
+from src.pdf_summarization._ocr_model import OCRModel
+
+VOCABULARY = {"and", "art", "of", "recognition", "self", "supervised", "the"}
+
+
+@pytest.mark.parametrize(
+    "lines, expected",
+    [
+        # the joined word is a word
+        (["speech recog-", "nition is"], "speech recognition is"),
+        # the part before the hyphen is not a word on its own
+        (["hyphen-", "ation"], "hyphenation"),
+        # compound words keep the hyphen
+        (["self-", "supervised learning"], "self-supervised learning"),
+        (["state-of-the-", "art models"], "state-of-the-art models"),
+        # a hyphen followed by a conjunction keeps the space
+        (["first- and", "second-order"], "first- and second-order"),
+        (["pre-", "and post-training"], "pre- and post-training"),
+        # not hyphenated
+        (["the first", "line"], "the first line"),
+        (["a dash -", "next"], "a dash - next"),
+        (["Self-", "Supervised"], "Self- Supervised"),
+    ],
+)
+def test_join_lines(lines, expected) -> None:
+    assert OCRModel.join_lines(lines, VOCABULARY) == expected
+
+
+def test_join_lines_single_line() -> None:
+    assert OCRModel.join_lines(["only-"], VOCABULARY) == "only-"
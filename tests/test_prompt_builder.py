@@ -0,0 +1,49 @@
+from src.pdf_summarization._prompt_builder import PromptBuilder
+
+
+def test_compact_removes_repeated_headers() -> None:
+    page = "arXiv preprint\nThe {} page of the body.\n"
+    text = "".join(page.format(ordinal) for ordinal in ["first", "second", "third"])
+
+    compacted = PromptBuilder().compact(text)
+
+    assert compacted.text.split("\n") == [
+        "arXiv preprint",
+        "The first page of the body.",
+        "The second page of the body.",
+        "The third page of the body.",
+    ]
+    assert compacted.tokens_saved == 4
+
+
+def test_compact_keeps_lines_below_the_thresholds() -> None:
+    # repeated fewer times than min_header_repeats
+    text = "arXiv preprint\nbody\narXiv preprint"
+    assert PromptBuilder().compact(text).text == text
+
+    # longer than max_header_length
+    text = "\n".join(["a long repeated sentence" * 4] * 3)
+    assert PromptBuilder(max_header_length=80).compact(text).text == text
+    assert PromptBuilder(max_header_length=96).compact(text).text == "a long repeated sentence" * 4
+
+
+def test_compact_collapses_whitespace() -> None:
+    compacted = PromptBuilder().compact("  The   body\tof \n\n\n the  paper. \n")
+
+    assert compacted.text == "The body of\nthe paper."
+    assert compacted.tokens_saved == 0
+
+
+def test_compact_counts_tokens_with_the_given_function() -> None:
+    compacted = PromptBuilder(count_tokens=len).compact("a  b")
+
+    assert compacted.original_tokens == 4
+    assert compacted.compacted_tokens == 3
+
+
+def test_build_embeds_the_text() -> None:
+    messages = PromptBuilder().build("The body.")
+
+    assert [message["role"] for message in messages] == ["system", "user"]
+    assert "The body." in messages[0]["content"]
+    assert messages[1]["content"] == PromptBuilder.USER_PROMPT
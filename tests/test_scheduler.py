@@ -0,0 +1,158 @@
+import threading
+import time
+from typing import Callable, List
+
+from src.pdf_summarization._scheduler import LatencyRecorder, Priority, PriorityScheduler
+
+
+def wait_until(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def waiting(scheduler: PriorityScheduler, priority: Priority) -> int:
+    return scheduler._PriorityScheduler__waiting[priority]
+
+
+def running(scheduler: PriorityScheduler, priority: Priority) -> int:
+    return scheduler._PriorityScheduler__running[priority]
+
+
+class Holder(threading.Thread):
+    """
+    A thread which holds a slot until it is released.
+    """
+
+    def __init__(
+        self, scheduler: PriorityScheduler, priority: Priority, name: str, order: List[str]
+    ) -> None:
+        super().__init__(name=name, daemon=True)
+        self.scheduler = scheduler
+        self.priority = priority
+        self.order = order
+        self.acquired = threading.Event()
+        self.release = threading.Event()
+
+    def run(self) -> None:
+        with self.scheduler.slot(self.priority):
+            self.order.append(self.name)
+            self.acquired.set()
+            self.release.wait()
+
+
+def test_interactive_is_granted_the_next_slot() -> None:
+    scheduler = PriorityScheduler(max_concurrency=1)
+    order: List[str] = []
+
+    batch = Holder(scheduler, Priority.BATCH, "batch", order)
+    batch.start()
+    batch.acquired.wait()
+
+    # a batch waiter arrives before the interactive one
+    next_batch = Holder(scheduler, Priority.BATCH, "next_batch", order)
+    next_batch.start()
+    wait_until(lambda: waiting(scheduler, Priority.BATCH) == 1)
+    interactive = Holder(scheduler, Priority.INTERACTIVE, "interactive", order)
+    interactive.start()
+    wait_until(lambda: waiting(scheduler, Priority.INTERACTIVE) == 1)
+
+    batch.release.set()
+    interactive.acquired.wait()
+    assert order == ["batch", "interactive"]
+
+    interactive.release.set()
+    next_batch.acquired.wait()
+    next_batch.release.set()
+    for holder in [batch, next_batch, interactive]:
+        holder.join()
+    assert order == ["batch", "interactive", "next_batch"]
+
+
+def test_batch_never_exceeds_its_share() -> None:
+    scheduler = PriorityScheduler(max_concurrency=3, shares={Priority.BATCH: 1})
+    order: List[str] = []
+
+    batches = [Holder(scheduler, Priority.BATCH, f"batch{i}", order) for i in range(3)]
+    for batch in batches:
+        batch.start()
+    wait_until(lambda: waiting(scheduler, Priority.BATCH) == 2)
+    assert running(scheduler, Priority.BATCH) == 1
+
+    # the slots left over by the batch are free for interactive work
+    interactives = [
+        Holder(scheduler, Priority.INTERACTIVE, f"interactive{i}", order) for i in range(2)
+    ]
+    for interactive in interactives:
+        interactive.start()
+        interactive.acquired.wait()
+    assert running(scheduler, Priority.BATCH) == 1
+
+    for holder in batches + interactives:
+        holder.release.set()
+    for holder in batches + interactives:
+        holder.join()
+    assert sorted(order) == sorted(holder.name for holder in batches + interactives)
+    assert scheduler.stats()[Priority.BATCH].count == 3
+
+
+def test_waiting_batch_does_not_block_interactive_within_its_share() -> None:
+    scheduler = PriorityScheduler(max_concurrency=2, shares={Priority.INTERACTIVE: 1})
+    order: List[str] = []
+
+    interactive = Holder(scheduler, Priority.INTERACTIVE, "interactive", order)
+    interactive.start()
+    interactive.acquired.wait()
+
+    # an interactive waiter over its share does not hold back the batch
+    next_interactive = Holder(scheduler, Priority.INTERACTIVE, "next_interactive", order)
+    next_interactive.start()
+    wait_until(lambda: waiting(scheduler, Priority.INTERACTIVE) == 1)
+    batch = Holder(scheduler, Priority.BATCH, "batch", order)
+    batch.start()
+    batch.acquired.wait()
+
+    for holder in [interactive, next_interactive, batch]:
+        holder.release.set()
+        holder.join()
+    assert order == ["interactive", "batch", "next_interactive"]
+
+
+def test_stats_keep_the_latest_samples() -> None:
+    scheduler = PriorityScheduler(max_samples=3)
+    for _ in range(5):
+        with scheduler.slot(Priority.BATCH):
+            pass
+    with scheduler.slot(Priority.INTERACTIVE):
+        pass
+
+    stats = scheduler.stats()
+    assert stats[Priority.BATCH].count == 3
+    assert stats[Priority.INTERACTIVE].count == 1
+
+
+def test_stats_reset_only_the_given_classes() -> None:
+    scheduler = PriorityScheduler()
+    for priority in Priority:
+        with scheduler.slot(priority):
+            pass
+
+    stats = scheduler.stats(reset=(Priority.BATCH,))
+    assert stats[Priority.BATCH].count == 1
+
+    stats = scheduler.stats()
+    assert stats[Priority.BATCH].count == 0
+    assert stats[Priority.INTERACTIVE].count == 1
+
+
+def test_latency_recorder() -> None:
+    recorder = LatencyRecorder(max_samples=2)
+    for _ in range(3):
+        with recorder.measure(Priority.INTERACTIVE):
+            pass
+
+    stats = recorder.stats(reset=(Priority.INTERACTIVE,))
+    assert stats[Priority.INTERACTIVE].count == 2
+    assert stats[Priority.BATCH].count == 0
+    assert recorder.stats()[Priority.INTERACTIVE].count == 0